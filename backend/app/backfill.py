@@ -0,0 +1,55 @@
+"""Backfill daily snapshots for past dates from Asana task history.
+
+Usage:
+    python -m app.backfill [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD] [--workers N]
+
+Re-running after an interruption resumes from the checkpointed task
+histories and skips days that were already written.
+"""
+import argparse
+import logging
+from datetime import date
+
+from app.config import get_settings
+from app.database import Base, SessionLocal, add_missing_columns, add_missing_indexes, engine
+from app.services.asana_client import close_asana_client
+from app.services.backfill_service import BackfillService
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Reconstruct daily snapshots from Asana task history.")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="first day to backfill (default: oldest task)")
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        help="last day to backfill (default: the day before the first snapshot taken by a sync)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_settings().backfill_workers,
+        help="concurrent Asana story requests"
+    )
+    args = parser.parse_args(argv)
+    if args.end_date is not None and args.end_date >= date.today():
+        parser.error("--end-date must be before today; today's snapshot is taken by the sync")
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    add_missing_indexes(engine)
+
+    try:
+        with SessionLocal() as db:
+            BackfillService(db).backfill(args.start_date, args.end_date, args.workers)
+    finally:
+        close_asana_client()
+
+
+if __name__ == "__main__":
+    main()
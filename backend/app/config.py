@@ -1,5 +1,6 @@
 from functools import lru_cache
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +14,7 @@ class Settings(BaseSettings):
     asana_field_students_count: str = ""
     asana_field_hardware_types: str = ""
     asana_field_point_of_contact: str = ""
+    asana_api_url: str = "https://app.asana.com/api/1.0"
 
     # Database
     database_url: str = "sqlite:///./data/academic_program.db"
@@ -20,6 +22,11 @@ class Settings(BaseSettings):
     # Sync Settings
     sync_schedule_hours: int = 24
     enable_scheduled_sync: bool = True
+    backfill_workers: int = 8
+
+    # Static dashboard bundle written after each successful sync (empty disables it)
+    dashboard_bundle_dir: str = ""
+    dashboard_bundle_keep_versions: int = Field(3, ge=1)
 
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
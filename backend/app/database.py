@@ -1,6 +1,7 @@
 from collections.abc import Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import get_settings
@@ -23,3 +24,38 @@ def get_db() -> Iterator[Session]:
         yield db
     finally:
         db.close()
+
+
+def add_missing_columns(bind: Engine) -> None:
+    """Add model columns that are missing from existing tables.
+
+    create_all only creates absent tables, so columns added to a model after
+    its table was first created need an explicit ALTER TABLE.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def add_missing_indexes(bind: Engine) -> None:
+    """Create model indexes that are missing from existing tables.
+
+    Like columns, indexes declared after a table was first created are not
+    added by create_all.
+    """
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind)
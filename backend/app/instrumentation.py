@@ -0,0 +1,154 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"]
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries issued per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100, 500, 1000, 10000)
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries per HTTP request",
+    ["method", "route"]
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries executed")
+DB_QUERY_SECONDS = Counter("db_query_seconds_total", "Time spent executing database queries")
+SYNC_STAGE_DURATION = Histogram(
+    "sync_stage_duration_seconds",
+    "Duration of each Asana sync stage",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+
+COALESCED_CALLS = Counter(
+    "coalesced_calls_total",
+    "Calls to coalesced service operations by whether they ran, shared an in-flight run, or timed out waiting",
+    ["operation", "outcome"]
+)
+
+SYNC_STAGES = ("fetch", "parse", "upsert", "snapshot", "publish")
+
+
+@dataclass
+class QueryStats:
+    """Database work attributed to the current request."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.inc(elapsed)
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every query executed through the engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope: Scope) -> str:
+    """Use the matched route's path template so labels stay low-cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+def _server_timing(total_seconds: float, stats: QueryStats) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"total;dur={total_seconds * 1000:.2f}"
+    )
+
+
+class PerformanceMiddleware:
+    """Record per-route latency and query counts, and report them in Server-Timing."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            method = scope["method"]
+            route = _route_template(scope)
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - start)
+            REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.seconds)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(time.perf_counter() - start, stats))
+            await send(message)
+            # Record once the body is sent so background tasks do not count as latency
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record()
+            _query_stats.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str, timings: dict[str, float]) -> Iterator[None]:
+    """Time a sync stage into `timings` and the stage histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[stage] = elapsed
+        SYNC_STAGE_DURATION.labels(stage).observe(elapsed)
+
+
+def render_prometheus() -> tuple[bytes, str]:
+    """Render all registered metrics in the Prometheus text format."""
+    return generate_latest(), CONTENT_TYPE_LATEST
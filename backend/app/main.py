@@ -4,10 +4,15 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
-from app.database import Base, engine
-from app.routers import metrics, sync, universities
+from app.database import Base, SessionLocal, add_missing_columns, add_missing_indexes, engine
+from app.instrumentation import PerformanceMiddleware, instrument_engine
+from app.routers import changes, metrics, sync, universities
+from app.services.asana_client import close_asana_client
+from app.services.bundle_service import DashboardBundleService
+from app.services.version_service import UniversityVersionService
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,14 +21,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
+instrument_engine(engine)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    add_missing_indexes(engine)
     logger.info("Database tables created")
+    with SessionLocal() as db:
+        UniversityVersionService(db).rebuild_if_empty()
+        if settings.dashboard_bundle_dir:
+            bundle = DashboardBundleService(db, settings.dashboard_bundle_dir, settings.dashboard_bundle_keep_versions)
+            if not bundle.is_published():
+                bundle.publish()
     yield
     logger.info("Shutting down")
+    close_asana_client()
 
 
 app = FastAPI(
@@ -31,10 +46,12 @@ app = FastAPI(
     description="Dashboard API for tracking university collaborations with Tenstorrent",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=None,
     redoc_url=None
 )
 
+app.add_middleware(PerformanceMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
@@ -46,3 +63,4 @@ app.add_middleware(
 app.include_router(metrics.router, prefix="/api/v1")
 app.include_router(universities.router, prefix="/api/v1")
 app.include_router(sync.router, prefix="/api/v1")
+app.include_router(changes.router, prefix="/api/v1")
@@ -1,3 +1,19 @@
-from app.models.snapshot import Snapshot, UniversitySnapshot, UniversityCurrent, SyncLog
+from app.models.snapshot import (
+    Snapshot,
+    UniversitySnapshot,
+    UniversityCurrent,
+    UniversityVersion,
+    UniversityChange,
+    SyncLog,
+    BackfillTask,
+)
 
-__all__ = ["Snapshot", "UniversitySnapshot", "UniversityCurrent", "SyncLog"]
+__all__ = [
+    "Snapshot",
+    "UniversitySnapshot",
+    "UniversityCurrent",
+    "UniversityVersion",
+    "UniversityChange",
+    "SyncLog",
+    "BackfillTask",
+]
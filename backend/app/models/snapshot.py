@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Integer, String, Date, DateTime, Float, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import date, datetime
 from app.database import Base
 
+# valid_to of a university version that is still current
+OPEN_VALID_TO = date.max
+
 
 class Snapshot(Base):
     __tablename__ = "snapshots"
@@ -13,6 +16,7 @@ class Snapshot(Base):
     total_researchers = Column(Integer, nullable=False, default=0)
     total_students = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
+    backfilled = Column(Boolean, default=False)  # Reconstructed from Asana history rather than taken by a sync
 
     universities = relationship(
         "UniversitySnapshot",
@@ -23,6 +27,9 @@ class Snapshot(Base):
 
 class UniversitySnapshot(Base):
     __tablename__ = "university_snapshots"
+    __table_args__ = (
+        Index("ix_university_snapshots_gid_snapshot", "asana_task_gid", "snapshot_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     snapshot_id = Column(
@@ -56,6 +63,54 @@ class UniversityCurrent(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class UniversityVersion(Base):
+    """A university's snapshotted state over the dates it stayed unchanged.
+
+    Versions are derived from the snapshot stream: valid_from is the first
+    snapshot date showing this state and valid_to (exclusive) the first date
+    it no longer held, or OPEN_VALID_TO while it is still current.
+    """
+
+    __tablename__ = "university_versions"
+    __table_args__ = (
+        Index("ix_university_versions_validity", "valid_to", "valid_from"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    asana_task_gid = Column(String, nullable=False)
+    university_name = Column(String, nullable=False)
+    researchers_count = Column(Integer, default=0)
+    students_count = Column(Integer, default=0)
+    hardware_types = Column(Text)  # JSON string
+    point_of_contact = Column(String)
+    created_at = Column(DateTime)
+    valid_from = Column(Date, nullable=False)
+    valid_to = Column(Date, nullable=False)
+
+
+class UniversityChange(Base):
+    """One added, removed or field-level updated university, appended by a sync.
+
+    The autoincrementing id doubles as the cursor for the /changes feed.
+    """
+
+    __tablename__ = "university_changes"
+    __table_args__ = (
+        Index("ix_university_changes_gid", "asana_task_gid"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sync_id = Column(Integer, ForeignKey("sync_log.id", ondelete="SET NULL"))
+    asana_task_gid = Column(String, nullable=False)
+    university_name = Column(String, nullable=False)
+    change_type = Column(String, nullable=False)  # 'added', 'removed' or 'updated'
+    field = Column(String)  # Changed column, for 'updated' only
+    old_value = Column(Text)  # JSON
+    new_value = Column(Text)  # JSON
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+
 class SyncLog(Base):
     __tablename__ = "sync_log"
 
@@ -66,3 +121,23 @@ class SyncLog(Base):
     error_message = Column(Text)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime)
+    fetch_seconds = Column(Float)
+    parse_seconds = Column(Float)
+    upsert_seconds = Column(Float)
+    snapshot_seconds = Column(Float)
+    publish_seconds = Column(Float)
+
+
+class BackfillTask(Base):
+    """A task's reconstructed state history, checkpointed during a backfill.
+
+    Rows let an interrupted backfill resume without refetching stories and
+    are cleared once the backfill completes.
+    """
+
+    __tablename__ = "backfill_tasks"
+
+    asana_task_gid = Column(String, primary_key=True)
+    created_at = Column(DateTime)
+    versions = Column(Text, nullable=False)  # JSON list of [date, *state]
+    fetched_at = Column(DateTime, default=datetime.utcnow)
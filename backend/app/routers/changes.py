@@ -0,0 +1,68 @@
+from typing import Any
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.snapshot import UniversityChange
+from app.schemas.change import ChangeFeedResponse
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+def _json_fragment(value_json: str | None) -> orjson.Fragment | None:
+    """Embed a stored JSON value in the response without re-parsing it."""
+    return orjson.Fragment(value_json) if value_json is not None else None
+
+
+def _change_row_to_dict(row: Row) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "sync_id": row.sync_id,
+        "asana_task_gid": row.asana_task_gid,
+        "university_name": row.university_name,
+        "change_type": row.change_type,
+        "field": row.field,
+        "old_value": _json_fragment(row.old_value),
+        "new_value": _json_fragment(row.new_value),
+        "changed_at": row.changed_at,
+    }
+
+
+@router.get("/", response_model=ChangeFeedResponse)
+def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+) -> ORJSONResponse:
+    """Page through university changes recorded after the `since` cursor.
+
+    Pass the returned next_cursor as `since` to fetch the following page.
+    """
+    rows = db.execute(
+        select(
+            UniversityChange.id,
+            UniversityChange.sync_id,
+            UniversityChange.asana_task_gid,
+            UniversityChange.university_name,
+            UniversityChange.change_type,
+            UniversityChange.field,
+            UniversityChange.old_value,
+            UniversityChange.new_value,
+            UniversityChange.changed_at
+        ).where(
+            UniversityChange.id > since
+        ).order_by(UniversityChange.id).limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return ORJSONResponse({
+        "changes": [_change_row_to_dict(row) for row in rows],
+        "next_cursor": rows[-1].id if rows else since,
+        "has_more": has_more,
+    })
@@ -1,9 +1,10 @@
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.instrumentation import render_prometheus
 from app.schemas.metrics import CurrentMetrics, GrowthMetrics, MetricsTimeline
 from app.services.metrics_service import MetricsService
 
@@ -11,9 +12,12 @@ router = APIRouter(prefix="/metrics", tags=["metrics"])
 
 
 @router.get("/current", response_model=CurrentMetrics)
-def get_current_metrics(db: Session = Depends(get_db)) -> CurrentMetrics:
-    """Get current aggregate metrics from latest data."""
-    return MetricsService(db).get_current_metrics()
+def get_current_metrics(
+    as_of: date | None = Query(None),
+    db: Session = Depends(get_db)
+) -> CurrentMetrics:
+    """Get current aggregate metrics from latest data, or as of a past date."""
+    return MetricsService(db).get_current_metrics(as_of)
 
 
 @router.get("/timeline", response_model=MetricsTimeline)
@@ -44,3 +48,11 @@ def get_growth_metrics(
 def get_hardware_distribution(db: Session = Depends(get_db)) -> dict[str, int]:
     """Get distribution of hardware types across universities."""
     return MetricsService(db).get_hardware_distribution()
+
+
+@router.get("/prometheus", include_in_schema=False)
+def get_prometheus_metrics() -> Response:
+    """Expose request, query and sync stage instrumentation for Prometheus."""
+    body, content_type = render_prometheus()
+    # Set the header as-is: media_type would get a second charset appended, which Prometheus rejects
+    return Response(content=body, headers={"Content-Type": content_type})
@@ -1,40 +1,40 @@
-import json
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.snapshot import Snapshot, UniversityCurrent, UniversitySnapshot
-from app.schemas.university import UniversityListResponse, UniversityResponse
+from app.schemas.university import (
+    UniversityHistoryBatchRequest,
+    UniversityHistoryBatchResponse,
+    UniversityListResponse,
+    UniversityResponse,
+)
+from app.services.university_service import (
+    UNIVERSITY_COLUMNS,
+    UniversityService,
+    hardware_types_fragment,
+    university_row_to_dict,
+)
 
 router = APIRouter(prefix="/universities", tags=["universities"])
 
-SORT_COLUMNS = {
-    "university_name": UniversityCurrent.university_name,
-    "researchers_count": UniversityCurrent.researchers_count.desc(),
-    "students_count": UniversityCurrent.students_count.desc(),
-    "created_at": UniversityCurrent.created_at.desc(),
-}
-
-
-def _parse_hardware_types(hardware_json: str | None) -> list[str]:
-    """Parse hardware types from JSON string."""
-    return json.loads(hardware_json) if hardware_json else []
-
-
-def _university_to_response(uni: UniversityCurrent) -> UniversityResponse:
-    """Convert UniversityCurrent model to response schema."""
-    return UniversityResponse(
-        asana_task_gid=uni.asana_task_gid,
-        university_name=uni.university_name,
-        researchers_count=uni.researchers_count,
-        students_count=uni.students_count,
-        hardware_types=_parse_hardware_types(uni.hardware_types),
-        point_of_contact=uni.point_of_contact,
-        created_at=uni.created_at,
-        last_synced_at=uni.last_synced_at
-    )
+BATCH_HISTORY_DEFAULT_DAYS = 90
+
+
+def _period_start(day: date, resolution: str) -> date:
+    """First day of the week or month that a snapshot date falls in."""
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    return day
 
 
 @router.get("/", response_model=UniversityListResponse)
@@ -42,40 +42,24 @@ def get_universities(
     search: str | None = Query(None),
     sort_by: str = Query("university_name"),
     has_tenstorrent: bool | None = Query(None),
+    as_of: date | None = Query(None),
     db: Session = Depends(get_db)
-) -> UniversityListResponse:
-    """Get list of all universities with current data."""
-    query = db.query(UniversityCurrent)
-
-    if search:
-        query = query.filter(
-            UniversityCurrent.university_name.ilike(f"%{search}%")
-        )
-
-    if has_tenstorrent:
-        query = query.filter(
-            UniversityCurrent.hardware_types.isnot(None),
-            UniversityCurrent.hardware_types != '[]'
-        )
-
-    sort_column = SORT_COLUMNS.get(sort_by, UniversityCurrent.university_name)
-    universities = query.order_by(sort_column).all()
-
-    response_list = [_university_to_response(uni) for uni in universities]
-    return UniversityListResponse(universities=response_list, total=len(response_list))
+) -> ORJSONResponse:
+    """Get list of all universities with current data, or as of a past date."""
+    return ORJSONResponse(UniversityService(db).list_universities(search, sort_by, has_tenstorrent, as_of))
 
 
 @router.get("/{task_gid}", response_model=UniversityResponse)
-def get_university_detail(task_gid: str, db: Session = Depends(get_db)) -> UniversityResponse:
+def get_university_detail(task_gid: str, db: Session = Depends(get_db)) -> ORJSONResponse:
     """Get detailed info for a specific university."""
-    uni = db.query(UniversityCurrent).filter(
-        UniversityCurrent.asana_task_gid == task_gid
+    row = db.execute(
+        select(*UNIVERSITY_COLUMNS).where(UniversityCurrent.asana_task_gid == task_gid)
     ).first()
 
-    if not uni:
+    if not row:
         raise HTTPException(status_code=404, detail="University not found")
 
-    return _university_to_response(uni)
+    return ORJSONResponse(university_row_to_dict(row))
 
 
 @router.get("/{task_gid}/history")
@@ -83,22 +67,85 @@ def get_university_history(
     task_gid: str,
     limit: int = Query(30, le=365),
     db: Session = Depends(get_db)
-) -> list[dict[str, Any]]:
+) -> ORJSONResponse:
     """Get historical snapshots for a specific university."""
-    snapshots = db.query(UniversitySnapshot, Snapshot.snapshot_date).join(
-        Snapshot
-    ).filter(
-        UniversitySnapshot.asana_task_gid == task_gid
-    ).order_by(
-        Snapshot.snapshot_date.desc()
-    ).limit(limit).all()
-
-    return [
+    rows = db.execute(
+        select(
+            Snapshot.snapshot_date,
+            UniversitySnapshot.researchers_count,
+            UniversitySnapshot.students_count,
+            UniversitySnapshot.hardware_types
+        ).join(
+            Snapshot
+        ).where(
+            UniversitySnapshot.asana_task_gid == task_gid
+        ).order_by(
+            Snapshot.snapshot_date.desc()
+        ).limit(limit)
+    ).all()
+
+    return ORJSONResponse([
         {
-            "date": snapshot_date,
-            "researchers_count": uni_snapshot.researchers_count,
-            "students_count": uni_snapshot.students_count,
-            "hardware_types": _parse_hardware_types(uni_snapshot.hardware_types)
+            "date": row.snapshot_date,
+            "researchers_count": row.researchers_count,
+            "students_count": row.students_count,
+            "hardware_types": hardware_types_fragment(row.hardware_types)
         }
-        for uni_snapshot, snapshot_date in snapshots
-    ]
+        for row in rows
+    ])
+
+
+@router.post("/history:batch", response_model=UniversityHistoryBatchResponse)
+def get_university_history_batch(
+    request: UniversityHistoryBatchRequest,
+    db: Session = Depends(get_db)
+) -> ORJSONResponse:
+    """Get snapshot history for many universities in one query.
+
+    Each GID gets columnar date, researcher and student arrays. At week or
+    month resolution only the last snapshot of each period is kept.
+    """
+    end_date = request.end_date or date.today()
+    start_date = request.start_date or end_date - timedelta(days=BATCH_HISTORY_DEFAULT_DAYS)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+    histories: dict[str, dict[str, list[Any]]] = {
+        gid: {"dates": [], "researchers": [], "students": []}
+        for gid in request.task_gids
+    }
+    rows = db.execute(
+        select(
+            UniversitySnapshot.asana_task_gid,
+            Snapshot.snapshot_date,
+            UniversitySnapshot.researchers_count,
+            UniversitySnapshot.students_count
+        ).join(
+            Snapshot
+        ).where(
+            UniversitySnapshot.asana_task_gid.in_(histories),
+            Snapshot.snapshot_date.between(start_date, end_date)
+        ).order_by(
+            UniversitySnapshot.asana_task_gid,
+            Snapshot.snapshot_date
+        )
+    )
+
+    for gid, gid_rows in groupby(rows, key=itemgetter(0)):
+        dates, researchers, students = histories[gid].values()
+        for _, snapshot_date, researchers_count, students_count in gid_rows:
+            # Rows are in date order, so a later snapshot replaces an earlier one from the same period
+            if dates and _period_start(dates[-1], request.resolution) == _period_start(snapshot_date, request.resolution):
+                dates.pop()
+                researchers.pop()
+                students.pop()
+            dates.append(snapshot_date)
+            researchers.append(researchers_count)
+            students.append(students_count)
+
+    return ORJSONResponse({
+        "start_date": start_date,
+        "end_date": end_date,
+        "resolution": request.resolution,
+        "histories": histories,
+    })
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ChangeEntry(BaseModel):
+    id: int
+    sync_id: int | None = None
+    asana_task_gid: str
+    university_name: str
+    change_type: str
+    field: str | None = None
+    old_value: Any = None
+    new_value: Any = None
+    changed_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: list[ChangeEntry]
+    next_cursor: int
+    has_more: bool
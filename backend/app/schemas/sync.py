@@ -26,6 +26,11 @@ class SyncHistoryEntry(BaseModel):
     error_message: str | None = None
     started_at: datetime
     completed_at: datetime | None = None
+    fetch_seconds: float | None = None
+    parse_seconds: float | None = None
+    upsert_seconds: float | None = None
+    snapshot_seconds: float | None = None
+    publish_seconds: float | None = None
 
 
 class SyncHistoryResponse(BaseModel):
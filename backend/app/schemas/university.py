@@ -1,16 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
-
-class UniversityData(BaseModel):
-    asana_task_gid: str
-    university_name: str
-    researchers_count: int = 0
-    students_count: int = 0
-    hardware_types: list[str] = []
-    point_of_contact: str | None = None
-    created_at: datetime | None = None
+MAX_BATCH_HISTORY_GIDS = 500
 
 
 class UniversityResponse(BaseModel):
@@ -29,3 +22,23 @@ class UniversityResponse(BaseModel):
 class UniversityListResponse(BaseModel):
     universities: list[UniversityResponse]
     total: int
+
+
+class UniversityHistoryBatchRequest(BaseModel):
+    task_gids: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_HISTORY_GIDS)
+    start_date: date | None = None
+    end_date: date | None = None
+    resolution: Literal["day", "week", "month"] = "day"
+
+
+class UniversityHistorySeries(BaseModel):
+    dates: list[date]
+    researchers: list[int]
+    students: list[int]
+
+
+class UniversityHistoryBatchResponse(BaseModel):
+    start_date: date
+    end_date: date
+    resolution: str
+    histories: dict[str, UniversityHistorySeries]
@@ -1,12 +1,15 @@
+import json
 import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
-import asana
-from asana.rest import ApiException
+import orjson
 
 from app.config import get_settings
-from app.schemas.university import UniversityData
 
 logger = logging.getLogger(__name__)
 
@@ -28,38 +31,200 @@ OPT_FIELDS = [
     "custom_fields.display_value"
 ]
 
+STORY_OPT_FIELDS = [
+    "created_at",
+    "resource_subtype",
+    "custom_field",
+    "custom_field.gid",
+    "old_number_value",
+    "old_text_value",
+    "old_multi_enum_values",
+    "old_multi_enum_values.name",
+    "old_name",
+    "old_section",
+    "old_section.name",
+]
+
+MAX_RATE_LIMIT_RETRIES = 5
+
+NEXT_PAGE_KEY = b'"next_page"'
+
+
+def _next_page(page: bytes) -> dict[str, Any] | None:
+    """Read a page's next_page cursor without decoding its data.
+
+    Asana puts next_page after data, so the cursor is usually just the tail
+    from the last "next_page" key onward. A quote inside a JSON string is
+    always escaped, so that key cannot be mistaken for string content; if
+    the tail still does not parse as the whole cursor, decode the full page.
+    """
+    start = page.rfind(NEXT_PAGE_KEY)
+    if start != -1:
+        try:
+            tail = orjson.loads(b"{" + page[start:])
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            return tail["next_page"]
+    return orjson.loads(page).get("next_page")
+
+
+@dataclass(slots=True)
+class UniversityRecord:
+    """Lean per-task record passed from AsanaClient to SyncService.
+
+    Validation happens at the API boundary, not here: fields are taken
+    straight from Asana's JSON with only the conversions the sync needs.
+    """
+
+    asana_task_gid: str
+    university_name: str
+    researchers_count: int
+    students_count: int
+    hardware_json: str  # Hardware type names as the JSON list stored in the database
+    point_of_contact: str | None
+    created_at: datetime | None
+
+
+class ParsedTask(NamedTuple):
+    """A task's university record along with the flags that decide whether it is active."""
+
+    record: UniversityRecord
+    completed: bool
+    descoped: bool
+
 
 class AsanaClient:
     def __init__(self) -> None:
+        # The SDK is imported here rather than at module level so that only
+        # a sync, not API startup or read-only requests, pays for loading it
+        import asana
+        from urllib3 import Retry
+
         settings = get_settings()
         configuration = asana.Configuration()
         configuration.access_token = settings.asana_access_token
+        configuration.host = settings.asana_api_url
+        # Leave a pooled connection for every backfill worker
+        configuration.connection_pool_maxsize = max(configuration.connection_pool_maxsize, settings.backfill_workers)
         self.api_client = asana.ApiClient(configuration)
+        # urllib3 would otherwise silently retry each 429 three more times on
+        # its own, so _fetch_page's Retry-After handling is the only 429 policy
+        self.api_client.rest_client.pool_manager.connection_pool_kw["retries"] = Retry(
+            total=3, respect_retry_after_header=False
+        )
         self.tasks_api = asana.TasksApi(self.api_client)
+        self.stories_api = asana.StoriesApi(self.api_client)
         self.settings = settings
+        self._field_gids = {
+            gid for gid in (
+                settings.asana_field_researchers_count,
+                settings.asana_field_students_count,
+                settings.asana_field_hardware_types,
+                settings.asana_field_point_of_contact,
+            ) if gid
+        }
 
-    def get_project_tasks(self) -> list[UniversityData]:
+    def close(self) -> None:
+        """Stop the SDK's worker threads and drop its pooled connections."""
+        pool = getattr(self.api_client, "pool", None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+        self.api_client.rest_client.pool_manager.clear()
+
+    def get_project_tasks(self) -> list[UniversityRecord]:
         """Fetch all tasks from the configured Asana project with custom fields."""
-        opts = {"opt_fields": ",".join(OPT_FIELDS), "limit": 100}
+        return self.parse_pages(self.fetch_task_pages())
+
+    def fetch_task_pages(self) -> list[bytes]:
+        """Fetch the configured project's tasks as undecoded JSON pages.
+
+        Pages are kept as raw bytes, which are far smaller than the decoded
+        task dicts, and decoded one at a time by parse_pages.
+        """
+        from asana.rest import ApiException
 
         try:
-            tasks = list(self.tasks_api.get_tasks_for_project(
+            pages = self._fetch_pages(
+                self.tasks_api.get_tasks_for_project,
                 self.settings.asana_project_gid,
-                opts
-            ))
-            logger.info(f"Fetched {len(tasks)} tasks from Asana")
+                OPT_FIELDS
+            )
+        except ApiException as e:
+            logger.error(f"Asana API error: {e}")
+            raise
 
-            universities = [
+        logger.info(f"Fetched {len(pages)} pages of tasks from Asana")
+        return pages
+
+    def fetch_story_pages(self, task_gid: str) -> list[bytes]:
+        """Fetch a task's stories, oldest first, as undecoded JSON pages."""
+        return self._fetch_pages(self.stories_api.get_stories_for_task, task_gid, STORY_OPT_FIELDS)
+
+    def _fetch_pages(self, fetch: Callable[..., Any], gid: str, opt_fields: list[str]) -> list[bytes]:
+        """Follow next_page offsets through a paginated collection."""
+        opts = {"opt_fields": ",".join(opt_fields), "limit": 100}
+        pages = []
+
+        while True:
+            page = self._fetch_page(fetch, gid, opts)
+            pages.append(page)
+
+            next_page = _next_page(page)
+            if not next_page:
+                break
+            opts = {**opts, "offset": next_page["offset"]}
+
+        return pages
+
+    def _fetch_page(self, fetch: Callable[..., Any], gid: str, opts: dict[str, Any]) -> bytes:
+        """Fetch one raw page, waiting out 429 responses for as long as Retry-After asks."""
+        from asana.rest import ApiException
+
+        retries = 0
+        while True:
+            try:
+                response = fetch(gid, opts, full_payload=True, _preload_content=False)
+                break
+            except ApiException as e:
+                if e.status != 429 or retries == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retries += 1
+                retry_after = float((e.headers or {}).get("Retry-After", 1))
+                logger.warning(f"Rate limited by Asana, retrying in {retry_after:g}s")
+                time.sleep(retry_after)
+
+        try:
+            return response.data
+        finally:
+            response.release_conn()
+
+    def parse_pages(self, pages: list[bytes]) -> list[UniversityRecord]:
+        """Parse task pages into universities, skipping completed and De-scoped ones."""
+        universities = []
+        total_tasks = 0
+
+        for page in pages:
+            tasks = orjson.loads(page)["data"]
+            total_tasks += len(tasks)
+            universities.extend(
                 self._parse_task_to_university(task)
                 for task in tasks
                 if not task.get("completed") and not self._is_descoped(task)
-            ]
-            logger.info(f"Filtered to {len(universities)} active universities (excluding De-scoped)")
-            return universities
+            )
 
-        except ApiException as e:
-            logger.error(f"Asana API error: {e}")
-            raise
+        logger.info(f"Fetched {total_tasks} tasks from Asana")
+        logger.info(f"Filtered to {len(universities)} active universities (excluding De-scoped)")
+        return universities
+
+    def parse_task(self, task: dict[str, Any]) -> ParsedTask:
+        """Parse a single task, whether or not it is active."""
+        return ParsedTask(
+            record=self._parse_task_to_university(task),
+            completed=bool(task.get("completed")),
+            descoped=self._is_descoped(task),
+        )
 
     def _is_descoped(self, task: dict[str, Any]) -> bool:
         """Check if a task is in the De-scoped section."""
@@ -70,9 +235,13 @@ class AsanaClient:
                 return True
         return False
 
-    def _parse_task_to_university(self, task: dict[str, Any]) -> UniversityData:
-        """Parse Asana task data into UniversityData schema."""
-        custom_fields = {cf["gid"]: cf for cf in task.get("custom_fields", [])}
+    def _parse_task_to_university(self, task: dict[str, Any]) -> UniversityRecord:
+        """Parse Asana task data into a UniversityRecord."""
+        custom_fields = {
+            cf["gid"]: cf
+            for cf in task.get("custom_fields", [])
+            if cf["gid"] in self._field_gids
+        }
 
         researchers_count = self._get_field_value(
             custom_fields,
@@ -106,12 +275,12 @@ class AsanaClient:
             except (ValueError, AttributeError):
                 created_at = None
 
-        return UniversityData(
+        return UniversityRecord(
             asana_task_gid=task["gid"],
             university_name=task.get("name", "Unknown"),
             researchers_count=int(researchers_count),
             students_count=int(students_count),
-            hardware_types=hardware_types,
+            hardware_json=json.dumps(hardware_types),
             point_of_contact=point_of_contact,
             created_at=created_at
         )
@@ -143,3 +312,29 @@ class AsanaClient:
                 return [v.get("name") for v in values if v]
             case _:
                 return field.get("display_value")
+
+
+_shared_client: AsanaClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_asana_client() -> AsanaClient:
+    """Return the process-wide Asana client, creating it on first use.
+
+    Sharing one client keeps its connection pool warm across syncs instead
+    of building a new SDK client, thread pool and connection pool each time.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = AsanaClient()
+        return _shared_client
+
+
+def close_asana_client() -> None:
+    """Close the shared Asana client if one was created."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
@@ -0,0 +1,326 @@
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime, time, timedelta
+from typing import Any, NamedTuple
+
+import orjson
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.snapshot import BackfillTask, Snapshot, UniversitySnapshot
+from app.services.asana_client import AsanaClient, get_asana_client
+from app.services.bundle_service import publish_configured_bundle
+from app.services.version_service import UniversityVersionService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_BATCH_SIZE = 100
+
+
+class TaskState(NamedTuple):
+    """A task's tracked fields as they stood at the end of a day."""
+
+    university_name: str
+    researchers_count: int
+    students_count: int
+    hardware_types: str  # JSON, as stored in snapshots
+    point_of_contact: str | None
+    completed: bool
+    descoped: bool
+
+
+def _story_date(story: dict[str, Any]) -> date:
+    return datetime.fromisoformat(story["created_at"].replace("Z", "+00:00")).date()
+
+
+def _bounded_map(
+    executor: ThreadPoolExecutor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_pending: int
+) -> Iterator[Any]:
+    """Like executor.map, but only keeps `max_pending` items in flight.
+
+    Results are yielded as they complete, so neither the inputs nor the
+    results of thousands of tasks pile up in memory at once.
+    """
+    pending: set[Future] = set()
+    for item in items:
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(executor.submit(fn, item))
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+class BackfillService:
+    """Reconstruct daily snapshots for dates before snapshots were recorded.
+
+    Each task's state is replayed backwards from its current values through
+    its change stories to get the state it held on every past day. Task
+    histories are fetched concurrently and checkpointed to backfill_tasks,
+    then written one day at a time; days that already have a snapshot are
+    skipped, so an interrupted backfill can simply be run again.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        settings = get_settings()
+        self._field_columns = {
+            gid: column for gid, column in (
+                (settings.asana_field_researchers_count, "researchers_count"),
+                (settings.asana_field_students_count, "students_count"),
+                (settings.asana_field_hardware_types, "hardware_types"),
+                (settings.asana_field_point_of_contact, "point_of_contact"),
+            ) if gid
+        }
+
+    @property
+    def asana_client(self) -> AsanaClient:
+        return get_asana_client()
+
+    def backfill(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        workers: int = 8
+    ) -> int:
+        """Backfill snapshots for each day from `start_date` to `end_date`.
+
+        Defaults to the span from the oldest task's creation to the day
+        before the first snapshot taken by a sync (or yesterday). Earlier
+        backfilled snapshots do not move that default, so an interrupted
+        run picks up the same range again. Returns the number of snapshots
+        written. `end_date` must be before today: today's snapshot belongs to
+        the sync, and a later one would push every sync's snapshot out of
+        date order.
+        """
+        if end_date is not None and end_date >= date.today():
+            raise ValueError(f"end_date must be before today, got {end_date}")
+
+        self.fetch_histories(workers)
+
+        created_dates, events = self._load_histories()
+        if not created_dates:
+            logger.info("No tasks to backfill")
+            return 0
+
+        if start_date is None:
+            start_date = min(created_dates)
+        if end_date is None:
+            first_live_snapshot = self.db.execute(
+                select(func.min(Snapshot.snapshot_date)).where(Snapshot.backfilled.isnot(True))
+            ).scalar()
+            end_date = (first_live_snapshot or date.today()) - timedelta(days=1)
+        if start_date > end_date:
+            # Keep the checkpoints: nothing was written, so nothing is finished
+            logger.info(f"Nothing to backfill between {start_date} and {end_date}")
+            return 0
+
+        written = self._write_snapshots(start_date, end_date, events)
+        UniversityVersionService(self.db).rebuild()
+        self.db.execute(delete(BackfillTask))
+        self.db.commit()
+
+        logger.info(f"Backfilled {written} snapshots from {start_date} to {end_date}")
+        if written:
+            # The bundled timeline may cover the backfilled days
+            publish_configured_bundle(self.db)
+        return written
+
+    def fetch_histories(self, workers: int = 8) -> None:
+        """Fetch and checkpoint the state history of every task not yet checkpointed."""
+        client = self.asana_client
+        done = set(self.db.execute(select(BackfillTask.asana_task_gid)).scalars())
+
+        def tasks() -> Iterator[dict[str, Any]]:
+            for page in client.fetch_task_pages():
+                for task in orjson.loads(page)["data"]:
+                    if task["gid"] not in done:
+                        yield task
+
+        batch: list[dict[str, Any]] = []
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for row in _bounded_map(executor, self._task_history, tasks(), workers * 4):
+                if row is None:
+                    continue
+                batch.append(row)
+                if len(batch) >= CHECKPOINT_BATCH_SIZE:
+                    fetched += self._checkpoint(batch)
+            fetched += self._checkpoint(batch)
+
+        logger.info(f"Fetched story histories for {fetched} tasks ({len(done)} already checkpointed)")
+
+    def _checkpoint(self, batch: list[dict[str, Any]]) -> int:
+        count = len(batch)
+        if batch:
+            self.db.execute(insert(BackfillTask), batch)
+            self.db.commit()
+            batch.clear()
+        return count
+
+    def _task_history(self, task: dict[str, Any]) -> dict[str, Any] | None:
+        """Replay a task's stories backwards into dated states, oldest first.
+
+        Returns None for a task with neither a creation date nor stories,
+        since nothing says when it began. Runs on a worker thread, so it only
+        talks to Asana, not the database.
+        """
+        client = self.asana_client
+        record, completed, descoped = client.parse_task(task)
+        state = TaskState(
+            university_name=record.university_name,
+            researchers_count=record.researchers_count,
+            students_count=record.students_count,
+            hardware_types=record.hardware_json,
+            point_of_contact=record.point_of_contact,
+            completed=completed,
+            descoped=descoped,
+        )
+
+        changes = []
+        first_story = None
+        for page in client.fetch_story_pages(task["gid"]):
+            stories = orjson.loads(page)["data"]
+            if first_story is None and stories:
+                first_story = stories[0]
+            changes.extend(story for story in stories if self._undo(state, story) is not None)
+
+        # Without a creation date, the oldest story is the earliest the task is known to exist
+        if record.created_at is not None:
+            created_on = record.created_at.date()
+        elif first_story is not None:
+            created_on = _story_date(first_story)
+        else:
+            logger.warning(f"Skipping task {record.asana_task_gid}: no creation date and no stories")
+            return None
+
+        # Each change opens a new state on its day; undoing it gives the state before
+        versions = []
+        for story in reversed(changes):
+            versions.append([_story_date(story).isoformat(), *state])
+            state = self._undo(state, story)
+        if changes:
+            created_on = min(created_on, _story_date(changes[0]))
+        versions.append([created_on.isoformat(), *state])
+        versions.reverse()
+
+        return {
+            "asana_task_gid": record.asana_task_gid,
+            "created_at": record.created_at or datetime.combine(created_on, time.min),
+            "versions": orjson.dumps(versions).decode(),
+        }
+
+    def _undo(self, state: TaskState, story: dict[str, Any]) -> TaskState | None:
+        """The state before `story` was made, or None if it changed nothing tracked."""
+        match story.get("resource_subtype"):
+            case "name_changed":
+                return state._replace(university_name=story.get("old_name") or state.university_name)
+            case "marked_complete":
+                return state._replace(completed=False)
+            case "marked_incomplete":
+                return state._replace(completed=True)
+            case "section_changed":
+                old_section = story.get("old_section") or {}
+                return state._replace(descoped=old_section.get("name", "").lower() == "de-scoped")
+
+        column = self._field_columns.get((story.get("custom_field") or {}).get("gid"))
+        match column:
+            case "researchers_count" | "students_count":
+                return state._replace(**{column: int(story.get("old_number_value") or 0)})
+            case "hardware_types":
+                values = story.get("old_multi_enum_values") or []
+                return state._replace(hardware_types=json.dumps([v.get("name") for v in values if v]))
+            case "point_of_contact":
+                return state._replace(point_of_contact=story.get("old_text_value"))
+        return None
+
+    def _load_histories(self) -> tuple[list[date], dict[date, list[tuple[str, datetime | None, TaskState]]]]:
+        """Load checkpointed histories as state changes grouped by the day they took effect."""
+        created_dates = []
+        events: dict[date, list[tuple[str, datetime | None, TaskState]]] = defaultdict(list)
+
+        rows = self.db.execute(
+            select(BackfillTask.asana_task_gid, BackfillTask.created_at, BackfillTask.versions)
+        )
+        for gid, created_at, versions in rows:
+            history = orjson.loads(versions)
+            created_dates.append(date.fromisoformat(history[0][0]))
+            for day, *state in history:
+                events[date.fromisoformat(day)].append((gid, created_at, TaskState(*state)))
+
+        return created_dates, events
+
+    def _write_snapshots(
+        self,
+        start_date: date,
+        end_date: date,
+        events: dict[date, list[tuple[str, datetime | None, TaskState]]]
+    ) -> int:
+        """Insert one snapshot per missing day, committing each day on its own."""
+        existing = set(self.db.execute(
+            select(Snapshot.snapshot_date).where(Snapshot.snapshot_date.between(start_date, end_date))
+        ).scalars())
+        event_days = sorted(events)
+        next_event = 0
+        states: dict[str, tuple[datetime | None, TaskState]] = {}
+        written = 0
+
+        day = start_date
+        while day <= end_date:
+            # Later entries for the same task and day win, leaving its end-of-day state
+            while next_event < len(event_days) and event_days[next_event] <= day:
+                for gid, created_at, state in events.pop(event_days[next_event]):
+                    states[gid] = (created_at, state)
+                next_event += 1
+
+            if day not in existing:
+                self._write_snapshot(day, states)
+                written += 1
+            day += timedelta(days=1)
+
+        return written
+
+    def _write_snapshot(self, day: date, states: dict[str, tuple[datetime | None, TaskState]]) -> None:
+        active = [
+            (gid, created_at, state)
+            for gid, (created_at, state) in states.items()
+            if not state.completed and not state.descoped
+        ]
+        snapshot_id = self.db.execute(
+            insert(Snapshot).values(
+                snapshot_date=day,
+                total_universities=len(active),
+                total_researchers=sum(state.researchers_count for _, _, state in active),
+                total_students=sum(state.students_count for _, _, state in active),
+                created_at=datetime.combine(day, time.max),
+                backfilled=True,
+            ).returning(Snapshot.id)
+        ).scalar_one()
+
+        if active:
+            # Inserting through the table skips ORM bulk-insert bookkeeping, which dominates at millions of rows
+            self.db.execute(insert(UniversitySnapshot.__table__), [
+                {
+                    "snapshot_id": snapshot_id,
+                    "asana_task_gid": gid,
+                    "university_name": state.university_name,
+                    "researchers_count": state.researchers_count,
+                    "students_count": state.students_count,
+                    "hardware_types": state.hardware_types,
+                    "point_of_contact": state.point_of_contact,
+                    "created_at": created_at,
+                }
+                for gid, created_at, state in active
+            ])
+        self.db.commit()
@@ -0,0 +1,129 @@
+import gzip
+import logging
+import os
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import brotli
+import orjson
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.metrics_service import MetricsService
+from app.services.university_service import UniversityService
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+TIMELINE_DAYS = 90
+GROWTH_PERIOD_DAYS = 30
+# Quality 11 shrinks the university list another ~20% but takes ~50x longer
+BROTLI_QUALITY = 9
+
+
+def _write_compressed(path: Path, body: bytes) -> None:
+    """Write a file alongside .gz and .br variants for nginx to serve as-is."""
+    path.write_bytes(body)
+    # A fixed mtime keeps identical payloads byte-identical once gzipped
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+    path.with_name(path.name + ".br").write_bytes(brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY))
+
+
+class DashboardBundleService:
+    """Publish the default dashboard views as a static bundle for nginx.
+
+    Each publish writes an immutable version directory, then atomically
+    replaces manifest.json to point at it, so readers never see a partially
+    written bundle and version files can be cached for as long as they exist.
+    """
+
+    def __init__(self, db: Session, bundle_dir: str | Path, keep_versions: int = 3) -> None:
+        # The version just published is always kept, so fewer than one cannot be honoured
+        if keep_versions < 1:
+            raise ValueError(f"keep_versions must be at least 1, got {keep_versions}")
+        self.db = db
+        self.bundle_dir = Path(bundle_dir)
+        self.keep_versions = keep_versions
+
+    def render(self, today: date) -> dict[str, bytes]:
+        """Render each bundled view to the JSON its API endpoint would return."""
+        metrics = MetricsService(self.db)
+        payloads: dict[str, Any] = {
+            "current": metrics.get_current_metrics().model_dump(mode="json"),
+            "growth": metrics.calculate_growth(GROWTH_PERIOD_DAYS).model_dump(mode="json"),
+            "hardware_distribution": metrics.get_hardware_distribution(),
+            "timeline": metrics.get_timeline(today - timedelta(days=TIMELINE_DAYS), today).model_dump(mode="json"),
+            "universities": UniversityService(self.db).list_universities(),
+        }
+        return {name: orjson.dumps(payload) for name, payload in payloads.items()}
+
+    def publish(self) -> str:
+        """Render and publish a new bundle version, returning its name."""
+        today = date.today()
+        files = self.render(today)
+        version = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.bundle_dir / f".{version}.tmp"
+        staging.mkdir()
+        for name, body in files.items():
+            _write_compressed(staging / f"{name}.json", body)
+        staging.rename(self.bundle_dir / version)
+
+        manifest = {
+            "version": version,
+            "generated_at": datetime.utcnow(),
+            "files": {name: f"{version}/{name}.json" for name in files},
+            "params": {
+                "timeline": {"start_date": today - timedelta(days=TIMELINE_DAYS), "end_date": today},
+                "growth": {"period_days": GROWTH_PERIOD_DAYS},
+            },
+        }
+        manifest_tmp = self.bundle_dir / f".{MANIFEST_NAME}.tmp"
+        manifest_tmp.write_bytes(orjson.dumps(manifest))
+        os.replace(manifest_tmp, self.bundle_dir / MANIFEST_NAME)
+
+        self._prune(version)
+        logger.info(f"Published dashboard bundle {version} to {self.bundle_dir}")
+        return version
+
+    def is_published(self) -> bool:
+        return (self.bundle_dir / MANIFEST_NAME).exists()
+
+    def _prune(self, current: str) -> None:
+        """Remove old versions and abandoned staging directories.
+
+        A few previous versions are kept so clients holding an older manifest
+        can still load the files it points at.
+        """
+        versions = sorted(
+            (path for path in self.bundle_dir.iterdir() if path.is_dir() and not path.name.startswith(".")),
+            key=lambda path: path.name
+        )
+        stale = [path for path in versions[:-self.keep_versions] if path.name != current]
+        stale += [path for path in self.bundle_dir.glob(".*.tmp") if path.is_dir()]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def publish_configured_bundle(db: Session) -> str | None:
+    """Publish the bundle to DASHBOARD_BUNDLE_DIR, if one is configured.
+
+    Callers publish after committing the data the bundle is rendered from,
+    so a failure here is logged rather than raised: the data stays, and the
+    bundle is only stale until the next publish. Returns the new version.
+    """
+    settings = get_settings()
+    if not settings.dashboard_bundle_dir:
+        return None
+    try:
+        return DashboardBundleService(
+            db,
+            settings.dashboard_bundle_dir,
+            settings.dashboard_bundle_keep_versions
+        ).publish()
+    except Exception as e:
+        logger.error(f"Publishing dashboard bundle failed: {e}")
+        return None
@@ -1,11 +1,20 @@
 import json
 from datetime import date, timedelta
 
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.orm import Session
 
-from app.models.snapshot import Snapshot, UniversityCurrent
+from app.models.snapshot import Snapshot, UniversityCurrent, UniversityVersion
 from app.schemas.metrics import CurrentMetrics, GrowthMetrics, MetricsTimeline, TimelineDataPoint
+from app.services.single_flight import SingleFlight
+from app.services.version_service import UniversityVersionService
+
+# How long concurrent callers wait on a shared full-table computation before running their own
+COALESCE_TIMEOUT_SECONDS = 10.0
+
+# Both scan every current university, which is what a post-sync refetch by every open dashboard piles onto
+_current_metrics_flight = SingleFlight[CurrentMetrics]("metrics_current", COALESCE_TIMEOUT_SECONDS)
+_hardware_distribution_flight = SingleFlight[dict[str, int]]("metrics_hardware_distribution", COALESCE_TIMEOUT_SECONDS)
 
 
 def _calc_growth(current_val: int, previous_val: int) -> float:
@@ -20,12 +29,28 @@ def _parse_hardware_types(hardware_json: str | None) -> list[str]:
     return json.loads(hardware_json) if hardware_json else []
 
 
+def forget_in_flight_metrics() -> None:
+    """Make callers after a data change recompute instead of joining a run that started before it."""
+    _current_metrics_flight.forget()
+    _hardware_distribution_flight.forget()
+
+
 class MetricsService:
     def __init__(self, db: Session) -> None:
         self.db = db
 
-    def get_current_metrics(self) -> CurrentMetrics:
-        """Get current aggregate metrics from universities_current table."""
+    def get_current_metrics(self, as_of: date | None = None) -> CurrentMetrics:
+        """Get current aggregate metrics from universities_current table.
+
+        With `as_of`, aggregate the university versions that held on that date instead.
+        Concurrent calls for the same date share one computation.
+        """
+        return _current_metrics_flight.do(as_of, lambda: self._compute_current_metrics(as_of))
+
+    def _compute_current_metrics(self, as_of: date | None) -> CurrentMetrics:
+        if as_of is not None:
+            return self._get_metrics_as_of(as_of)
+
         result = self.db.query(
             func.count(UniversityCurrent.id).label("total_universities"),
             func.coalesce(func.sum(UniversityCurrent.researchers_count), 0).label("total_researchers"),
@@ -56,6 +81,37 @@ class MetricsService:
             last_updated=result.last_updated
         )
 
+    def _get_metrics_as_of(self, as_of: date) -> CurrentMetrics:
+        """Aggregate metrics over the university versions valid on a past date."""
+        has_hardware = and_(
+            UniversityVersion.hardware_types.isnot(None),
+            UniversityVersion.hardware_types != "[]"
+        )
+        result = self.db.execute(
+            select(
+                func.count(UniversityVersion.id).label("total_universities"),
+                func.coalesce(func.sum(UniversityVersion.researchers_count), 0).label("total_researchers"),
+                func.coalesce(func.sum(UniversityVersion.students_count), 0).label("total_students"),
+                func.coalesce(func.sum(case((has_hardware, 1), else_=0)), 0).label("universities_with_tt"),
+                func.coalesce(
+                    func.sum(case((has_hardware, UniversityVersion.researchers_count), else_=0)), 0
+                ).label("researchers_on_tt"),
+                func.coalesce(
+                    func.sum(case((has_hardware, UniversityVersion.students_count), else_=0)), 0
+                ).label("students_on_tt"),
+            ).where(*UniversityVersionService.valid_at(as_of))
+        ).one()
+
+        return CurrentMetrics(
+            total_universities=result.total_universities,
+            total_researchers=int(result.total_researchers),
+            total_students=int(result.total_students),
+            universities_with_tt_hardware=int(result.universities_with_tt),
+            researchers_on_tt_hardware=int(result.researchers_on_tt),
+            students_on_tt_hardware=int(result.students_on_tt),
+            last_updated=UniversityVersionService(self.db).snapshot_time_as_of(as_of)
+        )
+
     def get_timeline(self, start_date: date, end_date: date) -> MetricsTimeline:
         """Get historical metrics for charting."""
         snapshots = self.db.query(Snapshot).filter(
@@ -105,7 +161,13 @@ class MetricsService:
         )
 
     def get_hardware_distribution(self) -> dict[str, int]:
-        """Get distribution of hardware types across universities."""
+        """Get distribution of hardware types across universities.
+
+        Concurrent calls share one computation.
+        """
+        return _hardware_distribution_flight.do(None, self._compute_hardware_distribution)
+
+    def _compute_hardware_distribution(self) -> dict[str, int]:
         universities = self.db.query(UniversityCurrent).all()
 
         hardware_counts: dict[str, int] = {}
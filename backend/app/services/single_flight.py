@@ -0,0 +1,85 @@
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.instrumentation import COALESCED_CALLS
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """One in-flight execution and the outcome its waiters will share."""
+
+    def __init__(self, timeout: float) -> None:
+        self.deadline = time.monotonic() + timeout
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight execution among concurrent identical calls.
+
+    The first caller for a key runs the computation; callers arriving with
+    the same key while it runs wait for it and receive the same result or
+    exception, so they must not mutate what they get back. Nothing is kept
+    once the call finishes, and the next caller computes afresh.
+
+    A call that overruns its deadline stops taking waiters. The first of its
+    waiters to time out starts a replacement run and the rest wait on that
+    one, so a stuck execution neither holds its callers forever nor lets
+    them all fall through to the database at once.
+    """
+
+    def __init__(self, name: str, timeout: float) -> None:
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T], timeout: float | None = None) -> T:
+        """Run `fn`, or wait for the in-flight run for `key` and share its outcome."""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None or call.expired()
+                if leader:
+                    call = self._calls[key] = _Call(self.timeout if timeout is None else timeout)
+                else:
+                    call.waiters += 1
+
+            if leader:
+                return self._run(key, call, fn)
+
+            if call.done.wait(max(call.deadline - time.monotonic(), 0)):
+                COALESCED_CALLS.labels(self.name, "coalesced").inc()
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            # The run is overdue: replace it, or join whichever waiter already did
+            COALESCED_CALLS.labels(self.name, "timeout").inc()
+
+    def forget(self) -> None:
+        """Stop handing in-flight runs to new callers, e.g. once the data they read has changed."""
+        with self._lock:
+            self._calls.clear()
+
+    def _run(self, key: Hashable, call: _Call[T], fn: Callable[[], T]) -> T:
+        COALESCED_CALLS.labels(self.name, "executed").inc()
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
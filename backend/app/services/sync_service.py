@@ -1,21 +1,55 @@
-import json
 import logging
 from datetime import date, datetime
 from typing import Any
 
+import orjson
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from app.models.snapshot import Snapshot, SyncLog, UniversityCurrent, UniversitySnapshot
-from app.schemas.university import UniversityData
-from app.services.asana_client import AsanaClient
+from app.config import get_settings
+from app.instrumentation import SYNC_STAGES, stage_timer
+from app.models.snapshot import Snapshot, SyncLog, UniversityChange, UniversityCurrent, UniversitySnapshot
+from app.services.asana_client import AsanaClient, UniversityRecord, get_asana_client
+from app.services.bundle_service import publish_configured_bundle
+from app.services.metrics_service import forget_in_flight_metrics
+from app.services.version_service import VERSIONED_FIELDS, UniversityVersionService
 
 logger = logging.getLogger(__name__)
 
 
+def _record_values(uni: UniversityRecord) -> dict[str, Any]:
+    """Column values a sync stores for a university, keyed by column name."""
+    return {
+        "university_name": uni.university_name,
+        "researchers_count": uni.researchers_count,
+        "students_count": uni.students_count,
+        "hardware_types": uni.hardware_json,
+        "point_of_contact": uni.point_of_contact,
+    }
+
+
+def _encode_value(field: str, value: Any) -> str:
+    """JSON-encode a column value for the change log."""
+    if field == "hardware_types":
+        return value or "[]"  # Already stored as JSON
+    return orjson.dumps(value).decode()
+
+
+def _encode_state(values: dict[str, Any]) -> str:
+    """JSON-encode a whole university state for added/removed change entries."""
+    return orjson.dumps({
+        field: orjson.Fragment(_encode_value(field, values[field]))
+        for field in VERSIONED_FIELDS
+    }).decode()
+
+
 class SyncService:
     def __init__(self, db: Session) -> None:
         self.db = db
-        self.asana_client = AsanaClient()
+
+    @property
+    def asana_client(self) -> AsanaClient:
+        return get_asana_client()
 
     def is_sync_in_progress(self) -> bool:
         return self.db.query(SyncLog).filter(
@@ -31,15 +65,22 @@ class SyncService:
 
     def execute_sync(self, sync_id: int, create_snapshot: bool = True) -> None:
         log = self.db.query(SyncLog).filter(SyncLog.id == sync_id).first()
+        timings: dict[str, float] = {}
 
         try:
-            universities = self.asana_client.get_project_tasks()
+            with stage_timer("fetch", timings):
+                pages = self.asana_client.fetch_task_pages()
+
+            with stage_timer("parse", timings):
+                universities = self.asana_client.parse_pages(pages)
             logger.info(f"Fetched {len(universities)} universities from Asana")
 
-            self._update_current_state(universities)
+            with stage_timer("upsert", timings):
+                self._update_current_state(universities, sync_id)
 
             if create_snapshot:
-                self._create_snapshot(universities)
+                with stage_timer("snapshot", timings):
+                    self._create_snapshot(universities)
 
             log.status = "success"
             log.tasks_synced = len(universities)
@@ -47,56 +88,102 @@ class SyncService:
 
         except Exception as e:
             logger.error(f"Sync failed: {e}")
+            self.db.rollback()
             log.status = "failed"
             log.error_message = str(e)
             log.completed_at = datetime.utcnow()
 
         self.db.commit()
+        if log.status == "success":
+            forget_in_flight_metrics()
+
+        # Publish only after the synced data is committed so the bundle never runs ahead of the database
+        if log.status == "success" and get_settings().dashboard_bundle_dir:
+            with stage_timer("publish", timings):
+                publish_configured_bundle(self.db)
+
+        for stage in SYNC_STAGES:
+            setattr(log, f"{stage}_seconds", timings.get(stage))
+        logger.info("Sync stage timings: " + ", ".join(
+            f"{stage}={seconds:.3f}s" for stage, seconds in timings.items()
+        ))
+
+        self.db.commit()
+
+    def _update_current_state(self, universities: list[UniversityRecord], sync_id: int | None = None) -> None:
+        """Update universities_current table with latest data and log what changed.
+
+        Current rows are loaded once and diffed against the incoming records in
+        a single pass; every addition, removal and changed field is appended to
+        university_changes.
+        """
+        now = datetime.utcnow()
+        existing = {uni.asana_task_gid: uni for uni in self.db.query(UniversityCurrent).all()}
+        changes: list[dict[str, Any]] = []
+
+        def log_change(gid: str, name: str, change_type: str, **values: Any) -> None:
+            changes.append({
+                "sync_id": sync_id,
+                "asana_task_gid": gid,
+                "university_name": name,
+                "change_type": change_type,
+                "field": None,
+                "old_value": None,
+                "new_value": None,
+                "changed_at": now,
+                **values,
+            })
 
-    def _update_current_state(self, universities: list[UniversityData]) -> None:
-        """Update universities_current table with latest data."""
         # Get all active university task GIDs from the current sync
         active_gids = {uni.asana_task_gid for uni in universities}
 
         # Update or insert active universities
         for uni in universities:
-            existing = self.db.query(UniversityCurrent).filter(
-                UniversityCurrent.asana_task_gid == uni.asana_task_gid
-            ).first()
-
-            hardware_json = json.dumps(uni.hardware_types)
-
-            if existing:
-                existing.university_name = uni.university_name
-                existing.researchers_count = uni.researchers_count
-                existing.students_count = uni.students_count
-                existing.hardware_types = hardware_json
-                existing.point_of_contact = uni.point_of_contact
-                existing.last_synced_at = datetime.utcnow()
-            else:
+            values = _record_values(uni)
+            current = existing.get(uni.asana_task_gid)
+
+            if current is None:
                 self.db.add(UniversityCurrent(
                     asana_task_gid=uni.asana_task_gid,
-                    university_name=uni.university_name,
-                    researchers_count=uni.researchers_count,
-                    students_count=uni.students_count,
-                    hardware_types=hardware_json,
-                    point_of_contact=uni.point_of_contact,
-                    created_at=uni.created_at or datetime.utcnow()
+                    created_at=uni.created_at or now,
+                    **values
                 ))
+                log_change(uni.asana_task_gid, uni.university_name, "added", new_value=_encode_state(values))
+                continue
+
+            for field, new_value in values.items():
+                old_value = getattr(current, field)
+                if old_value != new_value:
+                    log_change(
+                        uni.asana_task_gid,
+                        uni.university_name,
+                        "updated",
+                        field=field,
+                        old_value=_encode_value(field, old_value),
+                        new_value=_encode_value(field, new_value)
+                    )
+                    setattr(current, field, new_value)
+            current.last_synced_at = now
 
         # Remove universities that are no longer active (moved to De-scoped or completed)
         # Only delete if we have active universities (safety check to prevent accidental deletion)
         if active_gids:
-            deleted_count = self.db.query(UniversityCurrent).filter(
-                UniversityCurrent.asana_task_gid.notin_(active_gids)
-            ).delete(synchronize_session=False)
+            removed = [uni for gid, uni in existing.items() if gid not in active_gids]
+            for uni in removed:
+                old_values = {field: getattr(uni, field) for field in VERSIONED_FIELDS}
+                log_change(uni.asana_task_gid, uni.university_name, "removed", old_value=_encode_state(old_values))
+                self.db.delete(uni)
+
+            if removed:
+                logger.info(f"Removed {len(removed)} de-scoped or completed universities from database")
 
-            if deleted_count > 0:
-                logger.info(f"Removed {deleted_count} de-scoped or completed universities from database")
+        if changes:
+            self.db.execute(insert(UniversityChange), changes)
+        logger.info(f"Recorded {len(changes)} university changes")
 
         self.db.commit()
 
-    def _create_snapshot(self, universities: list[UniversityData]) -> None:
+    def _create_snapshot(self, universities: list[UniversityRecord]) -> None:
         """Create a point-in-time snapshot."""
         today = date.today()
         total_researchers = sum(u.researchers_count for u in universities)
@@ -119,6 +206,15 @@ class SyncService:
         snapshot.total_universities = len(universities)
         snapshot.total_researchers = total_researchers
         snapshot.total_students = total_students
+        snapshot.backfilled = False
+
+        # Tasks Asana gave no creation date for keep the first-seen time the current table stored
+        created_at = {uni.asana_task_gid: uni.created_at for uni in universities}
+        if None in created_at.values():
+            current_created_at = dict(self.db.execute(
+                select(UniversityCurrent.asana_task_gid, UniversityCurrent.created_at)
+            ).tuples().all())
+            created_at = {gid: value or current_created_at.get(gid) for gid, value in created_at.items()}
 
         for uni in universities:
             self.db.add(UniversitySnapshot(
@@ -127,11 +223,19 @@ class SyncService:
                 university_name=uni.university_name,
                 researchers_count=uni.researchers_count,
                 students_count=uni.students_count,
-                hardware_types=json.dumps(uni.hardware_types),
+                hardware_types=uni.hardware_json,
                 point_of_contact=uni.point_of_contact,
-                created_at=uni.created_at
+                created_at=created_at[uni.asana_task_gid]
             ))
 
+        # The session does not autoflush, and an out-of-order date makes
+        # record_snapshot rebuild from the snapshot rows in the database
+        self.db.flush()
+        UniversityVersionService(self.db).record_snapshot(today, {
+            uni.asana_task_gid: {**_record_values(uni), "created_at": created_at[uni.asana_task_gid]}
+            for uni in universities
+        })
+
         self.db.commit()
         logger.info(f"Created snapshot for {today} with {len(universities)} universities")
 
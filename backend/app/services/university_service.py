@@ -0,0 +1,112 @@
+from datetime import date
+from typing import Any
+
+import orjson
+from sqlalchemy import DateTime, Row, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import UniversityCurrent, UniversityVersion
+from app.services.version_service import UniversityVersionService
+
+# Column name and whether to sort descending
+SORT_COLUMNS = {
+    "university_name": ("university_name", False),
+    "researchers_count": ("researchers_count", True),
+    "students_count": ("students_count", True),
+    "created_at": ("created_at", True),
+}
+
+UNIVERSITY_COLUMNS = (
+    UniversityCurrent.asana_task_gid,
+    UniversityCurrent.university_name,
+    UniversityCurrent.researchers_count,
+    UniversityCurrent.students_count,
+    UniversityCurrent.hardware_types,
+    UniversityCurrent.point_of_contact,
+    UniversityCurrent.created_at,
+    UniversityCurrent.last_synced_at,
+)
+
+VERSION_COLUMNS = (
+    UniversityVersion.asana_task_gid,
+    UniversityVersion.university_name,
+    UniversityVersion.researchers_count,
+    UniversityVersion.students_count,
+    UniversityVersion.hardware_types,
+    UniversityVersion.point_of_contact,
+    UniversityVersion.created_at,
+)
+
+
+def _sort_column(model: type[UniversityCurrent] | type[UniversityVersion], sort_by: str) -> Any:
+    """Resolve a sort_by value against the table being listed."""
+    name, descending = SORT_COLUMNS.get(sort_by, SORT_COLUMNS["university_name"])
+    column = getattr(model, name)
+    return column.desc() if descending else column
+
+
+def hardware_types_fragment(hardware_json: str | None) -> orjson.Fragment:
+    """Embed the stored hardware types JSON in the response without re-parsing it."""
+    return orjson.Fragment(hardware_json or "[]")
+
+
+def university_row_to_dict(row: Row) -> dict[str, Any]:
+    """Build a UniversityResponse-shaped dict directly from a selected row.
+
+    Rows come from our own table, so they are serialized as-is rather than
+    being validated again against the response schema.
+    """
+    return {
+        "asana_task_gid": row.asana_task_gid,
+        "university_name": row.university_name,
+        "researchers_count": row.researchers_count,
+        "students_count": row.students_count,
+        "hardware_types": hardware_types_fragment(row.hardware_types),
+        "point_of_contact": row.point_of_contact,
+        "created_at": row.created_at,
+        "last_synced_at": row.last_synced_at,
+    }
+
+
+class UniversityService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def list_universities(
+        self,
+        search: str | None = None,
+        sort_by: str = "university_name",
+        has_tenstorrent: bool | None = None,
+        as_of: date | None = None
+    ) -> dict[str, Any]:
+        """List universities with current data, or as of a past date.
+
+        Returns a UniversityListResponse-shaped dict ready for orjson.
+        """
+        if as_of is None:
+            model = UniversityCurrent
+            query = select(*UNIVERSITY_COLUMNS)
+        else:
+            model = UniversityVersion
+            snapshot_time = UniversityVersionService(self.db).snapshot_time_as_of(as_of)
+            query = select(
+                *VERSION_COLUMNS,
+                literal(snapshot_time, DateTime).label("last_synced_at")
+            ).where(*UniversityVersionService.valid_at(as_of))
+
+        if search:
+            query = query.where(
+                model.university_name.ilike(f"%{search}%")
+            )
+
+        if has_tenstorrent:
+            query = query.where(
+                model.hardware_types.isnot(None),
+                model.hardware_types != '[]'
+            )
+
+        sort_column = _sort_column(model, sort_by)
+        rows = self.db.execute(query.order_by(sort_column)).all()
+
+        response_list = [university_row_to_dict(row) for row in rows]
+        return {"universities": response_list, "total": len(response_list)}
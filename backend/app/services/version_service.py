@@ -0,0 +1,174 @@
+import logging
+from collections.abc import Iterator, Mapping
+from itertools import groupby
+from operator import attrgetter
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import OPEN_VALID_TO, Snapshot, UniversitySnapshot, UniversityVersion
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_FIELDS = (
+    "university_name",
+    "researchers_count",
+    "students_count",
+    "hardware_types",
+    "point_of_contact",
+)
+CHUNK_SIZE = 500
+STREAM_SIZE = 10_000
+
+
+def _changed(version: Mapping[str, Any], state: Mapping[str, Any]) -> bool:
+    """Check whether a snapshotted state differs from an open version."""
+    return any(version[field] != state[field] for field in VERSIONED_FIELDS)
+
+
+def _chunks(values: list[int]) -> Iterator[list[int]]:
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start:start + CHUNK_SIZE]
+
+
+class UniversityVersionService:
+    """Maintain and query the valid-from/valid-to index over university snapshots."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    @staticmethod
+    def valid_at(as_of: date) -> tuple[ColumnElement[bool], ...]:
+        """Filter selecting the version of each university that held on `as_of`."""
+        return (UniversityVersion.valid_to > as_of, UniversityVersion.valid_from <= as_of)
+
+    def snapshot_time_as_of(self, as_of: date) -> datetime | None:
+        """When the latest snapshot on or before `as_of` was taken."""
+        return self.db.execute(
+            select(Snapshot.created_at).where(
+                Snapshot.snapshot_date <= as_of
+            ).order_by(Snapshot.snapshot_date.desc()).limit(1)
+        ).scalar()
+
+    def record_snapshot(self, snapshot_date: date, states: dict[str, dict[str, Any]]) -> None:
+        """Fold one day's snapshot into the version ranges.
+
+        `states` maps task GID to the snapshotted column values. Re-recording
+        the latest date replaces its earlier recording; a date older than the
+        latest snapshot falls back to a full rebuild.
+        """
+        latest = self.db.execute(select(func.max(Snapshot.snapshot_date))).scalar()
+        if latest is not None and latest > snapshot_date:
+            self.rebuild()
+            return
+
+        # Undo any earlier recording of this date before applying it again
+        self.db.execute(
+            delete(UniversityVersion).where(UniversityVersion.valid_from == snapshot_date)
+        )
+        self.db.execute(
+            update(UniversityVersion).where(
+                UniversityVersion.valid_to == snapshot_date
+            ).values(valid_to=OPEN_VALID_TO).execution_options(synchronize_session=False)
+        )
+
+        open_versions = {
+            row.asana_task_gid: row._mapping
+            for row in self.db.execute(
+                select(
+                    UniversityVersion.id,
+                    UniversityVersion.asana_task_gid,
+                    *(getattr(UniversityVersion, field) for field in VERSIONED_FIELDS)
+                ).where(UniversityVersion.valid_to == OPEN_VALID_TO)
+            )
+        }
+
+        closed_ids = [
+            version["id"]
+            for gid, version in open_versions.items()
+            if gid not in states or _changed(version, states[gid])
+        ]
+        new_versions = [
+            {**state, "asana_task_gid": gid, "valid_from": snapshot_date, "valid_to": OPEN_VALID_TO}
+            for gid, state in states.items()
+            if gid not in open_versions or _changed(open_versions[gid], state)
+        ]
+
+        for chunk in _chunks(closed_ids):
+            self.db.execute(
+                update(UniversityVersion).where(
+                    UniversityVersion.id.in_(chunk)
+                ).values(valid_to=snapshot_date).execution_options(synchronize_session=False)
+            )
+        if new_versions:
+            self.db.execute(insert(UniversityVersion), new_versions)
+
+        logger.info(
+            f"Recorded versions for {snapshot_date}: {len(new_versions)} opened, {len(closed_ids)} closed"
+        )
+
+    def rebuild(self) -> None:
+        """Recompute every version range by replaying all snapshots in date order.
+
+        Snapshot rows are streamed in one ordered query rather than fetched
+        per snapshot, which matters once years of daily snapshots exist.
+        """
+        self.db.execute(delete(UniversityVersion))
+
+        open_versions: dict[str, dict[str, Any]] = {}
+        versions: list[dict[str, Any]] = []
+        rows = self.db.execute(
+            select(
+                Snapshot.snapshot_date,
+                UniversitySnapshot.asana_task_gid,
+                UniversitySnapshot.created_at,
+                *(getattr(UniversitySnapshot, field) for field in VERSIONED_FIELDS)
+            ).outerjoin(
+                UniversitySnapshot, UniversitySnapshot.snapshot_id == Snapshot.id
+            ).order_by(Snapshot.snapshot_date).execution_options(yield_per=STREAM_SIZE)
+        )
+        snapshot_count = 0
+
+        for snapshot_date, snapshot_rows in groupby(rows, key=attrgetter("snapshot_date")):
+            snapshot_count += 1
+            # A snapshot without universities arrives as one all-NULL row and closes every open version
+            states = {
+                row.asana_task_gid: {
+                    "created_at": row.created_at,
+                    **{field: getattr(row, field) for field in VERSIONED_FIELDS},
+                }
+                for row in snapshot_rows
+                if row.asana_task_gid is not None
+            }
+
+            for gid in list(open_versions):
+                if gid not in states or _changed(open_versions[gid], states[gid]):
+                    version = open_versions.pop(gid)
+                    version["valid_to"] = snapshot_date
+                    versions.append(version)
+
+            for gid, state in states.items():
+                if gid not in open_versions:
+                    open_versions[gid] = {
+                        **state,
+                        "asana_task_gid": gid,
+                        "valid_from": snapshot_date,
+                        "valid_to": OPEN_VALID_TO,
+                    }
+
+        versions.extend(open_versions.values())
+        if versions:
+            self.db.execute(insert(UniversityVersion), versions)
+
+        logger.info(f"Rebuilt {len(versions)} university versions from {snapshot_count} snapshots")
+
+    def rebuild_if_empty(self) -> None:
+        """Build the index for databases that have snapshots but no versions yet."""
+        has_versions = self.db.execute(select(UniversityVersion.id).limit(1)).first() is not None
+        has_snapshots = self.db.execute(select(Snapshot.id).limit(1)).first() is not None
+
+        if has_snapshots and not has_versions:
+            self.rebuild()
+            self.db.commit()
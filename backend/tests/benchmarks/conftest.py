@@ -0,0 +1,158 @@
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.snapshot import Snapshot, UniversityCurrent, UniversitySnapshot
+from app.services.asana_client import AsanaClient, UniversityRecord, close_asana_client
+from app.services.version_service import UniversityVersionService
+from tests.fake_asana import FakeAsanaConfig, FakeAsanaServer, generate_tasks
+
+SIZES = [
+    100,
+    10_000,
+    pytest.param(100_000, marks=pytest.mark.slow),
+]
+
+TIMELINE_DAYS = 90
+HISTORY_DAYS = 5
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"n={n}")
+def num_universities(request: pytest.FixtureRequest) -> int:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def session_factory(num_universities: int, tmp_path_factory: pytest.TempPathFactory) -> Iterator[sessionmaker]:
+    """Fresh SQLite database per size so runs do not influence each other."""
+    db_path = tmp_path_factory.mktemp(f"bench-{num_universities}") / "bench.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory: sessionmaker) -> Iterator[Session]:
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="module")
+def fake_asana(num_universities: int) -> Iterator[FakeAsanaServer]:
+    # End story histories before yesterday, the last day a backfill may write
+    history_end = datetime.combine(date.today() - timedelta(days=1), time(), tzinfo=timezone.utc)
+    config = FakeAsanaConfig(num_tasks=num_universities, history_end=history_end)
+    with FakeAsanaServer(config) as server:
+        yield server
+
+
+@pytest.fixture
+def asana_url(fake_asana: FakeAsanaServer, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Point the shared AsanaClient at the fake server for the duration of a test."""
+    monkeypatch.setattr(get_settings(), "asana_api_url", fake_asana.url)
+    close_asana_client()
+    yield fake_asana.url
+    close_asana_client()
+
+
+@pytest.fixture(scope="module")
+def task_pages(num_universities: int) -> list[bytes]:
+    """Raw task pages as AsanaClient.fetch_task_pages returns them for the fake project."""
+    tasks = generate_tasks(FakeAsanaConfig(num_tasks=num_universities))
+    return [
+        orjson.dumps({"data": tasks[start:start + 100], "next_page": None})
+        for start in range(0, len(tasks), 100)
+    ]
+
+
+@pytest.fixture(scope="module")
+def universities(num_universities: int) -> list[UniversityRecord]:
+    """Parsed sync input equivalent to what AsanaClient returns for the fake project."""
+    client = AsanaClient()
+    tasks = generate_tasks(FakeAsanaConfig(num_tasks=num_universities))
+    return [client.parse_task(task).record for task in tasks]
+
+
+@pytest.fixture(scope="module")
+def seeded_session_factory(
+    session_factory: sessionmaker,
+    universities: list[UniversityRecord]
+) -> sessionmaker:
+    """Populate current state plus a realistic snapshot history."""
+    now = datetime.utcnow()
+    today = date.today()
+    current_rows = [
+        {
+            "asana_task_gid": uni.asana_task_gid,
+            "university_name": uni.university_name,
+            "researchers_count": uni.researchers_count,
+            "students_count": uni.students_count,
+            "hardware_types": uni.hardware_json,
+            "point_of_contact": uni.point_of_contact,
+            "created_at": uni.created_at or now,
+            "last_synced_at": now,
+            "updated_at": now,
+        }
+        for uni in universities
+    ]
+
+    with session_factory() as session:
+        session.execute(insert(UniversityCurrent), current_rows)
+
+        for days_ago in range(TIMELINE_DAYS, -1, -1):
+            snapshot_date = today - timedelta(days=days_ago)
+            scale = 1 - days_ago / (TIMELINE_DAYS * 2)
+            snapshot = Snapshot(
+                snapshot_date=snapshot_date,
+                total_universities=int(len(universities) * scale),
+                total_researchers=int(sum(u.researchers_count for u in universities) * scale),
+                total_students=int(sum(u.students_count for u in universities) * scale),
+            )
+            session.add(snapshot)
+            session.flush()
+
+            if days_ago < HISTORY_DAYS:
+                session.execute(insert(UniversitySnapshot), [
+                    {
+                        "snapshot_id": snapshot.id,
+                        "asana_task_gid": row["asana_task_gid"],
+                        "university_name": row["university_name"],
+                        "researchers_count": row["researchers_count"],
+                        "students_count": row["students_count"],
+                        "hardware_types": row["hardware_types"],
+                        "point_of_contact": row["point_of_contact"],
+                        "created_at": row["created_at"],
+                    }
+                    for row in current_rows
+                ])
+
+        UniversityVersionService(session).rebuild()
+        session.commit()
+
+    return session_factory
+
+
+@pytest.fixture(scope="module")
+def api_client(seeded_session_factory: sessionmaker) -> Iterator[TestClient]:
+    def _get_db() -> Iterator[Session]:
+        session = seeded_session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import BackfillTask, Snapshot, UniversitySnapshot
+from app.services.asana_client import AsanaClient
+from app.services.backfill_service import BackfillService
+from tests.benchmarks.thresholds import assert_within_threshold
+from tests.fake_asana import FakeAsanaServer
+
+BACKFILL_DAYS = 30
+
+
+def _clear_snapshots(db: Session) -> None:
+    db.execute(delete(UniversitySnapshot))
+    db.execute(delete(Snapshot))
+    db.execute(delete(BackfillTask))
+    db.commit()
+
+
+def test_backfill(
+    benchmark: BenchmarkFixture,
+    db: Session,
+    asana_url: str,
+    fake_asana: FakeAsanaServer,
+    task_pages: list[bytes],
+    num_universities: int
+) -> None:
+    service = BackfillService(db)
+    yesterday = date.today() - timedelta(days=1)
+
+    def setup() -> tuple[tuple, dict]:
+        _clear_snapshots(db)
+        return (), {"start_date": yesterday - timedelta(days=BACKFILL_DAYS - 1), "end_date": yesterday}
+
+    benchmark.pedantic(service.backfill, setup=setup, rounds=1)
+
+    # The fake's stories all happened before yesterday, so its reconstruction is the current state
+    universities = AsanaClient().parse_pages(task_pages)
+    latest = db.execute(select(Snapshot).where(Snapshot.snapshot_date == yesterday)).scalar_one()
+    assert db.query(Snapshot).count() == BACKFILL_DAYS
+    assert latest.total_universities == len(universities)
+    assert latest.total_researchers == sum(uni.researchers_count for uni in universities)
+    assert latest.total_students == sum(uni.students_count for uni in universities)
+    assert_within_threshold(benchmark, "backfill", num_universities)
@@ -0,0 +1,138 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy.orm import sessionmaker
+
+from app.services.asana_client import UniversityRecord
+from app.services.bundle_service import MANIFEST_NAME, DashboardBundleService
+from app.services.metrics_service import MetricsService
+from tests.benchmarks.thresholds import assert_within_threshold
+
+AS_OF = (date.today() - timedelta(days=2)).isoformat()
+BATCH_HISTORY_GIDS = 200
+BURST_CALLERS = 32
+BURST_ROUNDS = 5
+
+COLLECTION_ENDPOINTS: dict[str, tuple[str, dict[str, object]]] = {
+    "metrics_current": ("/api/v1/metrics/current", {}),
+    "metrics_current_as_of": ("/api/v1/metrics/current", {"as_of": AS_OF}),
+    "metrics_timeline": ("/api/v1/metrics/timeline", {}),
+    "metrics_growth": ("/api/v1/metrics/growth", {"period_days": 30}),
+    "metrics_hardware_distribution": ("/api/v1/metrics/hardware-distribution", {}),
+    "universities_list": ("/api/v1/universities/", {}),
+    "universities_list_search": ("/api/v1/universities/", {"search": "University 0001", "sort_by": "students_count"}),
+    "universities_list_tenstorrent": ("/api/v1/universities/", {"has_tenstorrent": True}),
+    "universities_list_as_of": ("/api/v1/universities/", {"as_of": AS_OF}),
+}
+
+UNIVERSITY_ENDPOINTS: dict[str, str] = {
+    "university_detail": "/api/v1/universities/{task_gid}",
+    "university_history": "/api/v1/universities/{task_gid}/history",
+}
+
+
+def _get(client: TestClient, path: str, params: dict[str, object]) -> Callable[[], None]:
+    def request() -> None:
+        response = client.get(path, params=params)
+        assert response.status_code == 200, response.text
+
+    return request
+
+
+@pytest.mark.parametrize("name", list(COLLECTION_ENDPOINTS))
+def test_collection_endpoint(
+    benchmark: BenchmarkFixture,
+    api_client: TestClient,
+    num_universities: int,
+    name: str
+) -> None:
+    path, params = COLLECTION_ENDPOINTS[name]
+    benchmark(_get(api_client, path, params))
+    assert_within_threshold(benchmark, name, num_universities)
+
+
+@pytest.mark.parametrize("name", list(UNIVERSITY_ENDPOINTS))
+def test_university_endpoint(
+    benchmark: BenchmarkFixture,
+    api_client: TestClient,
+    universities: list[UniversityRecord],
+    num_universities: int,
+    name: str
+) -> None:
+    task_gid = universities[len(universities) // 2].asana_task_gid
+    path = UNIVERSITY_ENDPOINTS[name].format(task_gid=task_gid)
+    benchmark(_get(api_client, path, {}))
+    assert_within_threshold(benchmark, name, num_universities)
+
+
+def test_publish_bundle(
+    benchmark: BenchmarkFixture,
+    seeded_session_factory: sessionmaker,
+    tmp_path: Path,
+    num_universities: int
+) -> None:
+    with seeded_session_factory() as session:
+        service = DashboardBundleService(session, tmp_path)
+        benchmark.pedantic(service.publish, rounds=5)
+
+    assert (tmp_path / MANIFEST_NAME).exists()
+    assert_within_threshold(benchmark, "publish_bundle", num_universities)
+
+
+def test_university_history_batch(
+    benchmark: BenchmarkFixture,
+    api_client: TestClient,
+    universities: list[UniversityRecord],
+    num_universities: int
+) -> None:
+    task_gids = [uni.asana_task_gid for uni in universities[::max(1, len(universities) // BATCH_HISTORY_GIDS)]]
+    body = {"task_gids": task_gids[:BATCH_HISTORY_GIDS], "resolution": "day"}
+
+    def request() -> None:
+        response = api_client.post("/api/v1/universities/history:batch", json=body)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["histories"]) == len(body["task_gids"])
+
+    benchmark(request)
+    assert_within_threshold(benchmark, "university_history_batch", num_universities)
+
+
+def _executions(operation: str) -> float:
+    return REGISTRY.get_sample_value(
+        "coalesced_calls_total", {"operation": operation, "outcome": "executed"}
+    ) or 0.0
+
+
+@pytest.mark.parametrize("name", ["metrics_current", "metrics_hardware_distribution"])
+def test_metrics_burst(
+    benchmark: BenchmarkFixture,
+    seeded_session_factory: sessionmaker,
+    num_universities: int,
+    name: str
+) -> None:
+    """Identical requests arriving together, as after a sync, share one computation."""
+    method = "get_current_metrics" if name == "metrics_current" else "get_hardware_distribution"
+
+    def call(_: int) -> object:
+        with seeded_session_factory() as session:
+            return getattr(MetricsService(session), method)()
+
+    with ThreadPoolExecutor(max_workers=BURST_CALLERS) as executor:
+        def burst() -> list[object]:
+            return list(executor.map(call, range(BURST_CALLERS)))
+
+        executions = _executions(name)
+        results = benchmark.pedantic(burst, rounds=BURST_ROUNDS)
+        executions = _executions(name) - executions
+
+    assert all(result == results[0] for result in results)
+    # Below 10k a computation can finish before the whole burst has arrived, so only larger sizes are held to this
+    if num_universities >= 10_000:
+        assert executions <= 2 * BURST_ROUNDS
+    assert_within_threshold(benchmark, f"{name}_burst", num_universities)
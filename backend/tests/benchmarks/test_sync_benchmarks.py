@@ -0,0 +1,92 @@
+import tracemalloc
+
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import SyncLog, UniversityCurrent
+from app.services.asana_client import AsanaClient, UniversityRecord
+from app.services.sync_service import SyncService
+from tests.benchmarks.thresholds import assert_peak_memory_within_threshold, assert_within_threshold
+from tests.fake_asana import FakeAsanaServer
+
+
+def _rounds(num_universities: int) -> int:
+    return max(1, min(10, 100_000 // (num_universities * 10)))
+
+
+def test_execute_sync(
+    benchmark: BenchmarkFixture,
+    db: Session,
+    asana_url: str,
+    fake_asana: FakeAsanaServer,
+    num_universities: int
+) -> None:
+    service = SyncService(db)
+
+    def setup() -> tuple[tuple[int], dict]:
+        return (service.start_sync("manual"),), {}
+
+    benchmark.pedantic(service.execute_sync, setup=setup, rounds=_rounds(num_universities))
+
+    last = db.query(SyncLog).order_by(SyncLog.id.desc()).first()
+    assert last.status == "success", last.error_message
+    assert last.tasks_synced == db.query(UniversityCurrent).count()
+    assert_within_threshold(benchmark, "execute_sync", num_universities)
+
+
+def test_parse_pages(
+    benchmark: BenchmarkFixture,
+    task_pages: list[bytes],
+    num_universities: int
+) -> None:
+    client = AsanaClient()
+
+    universities = benchmark(client.parse_pages, task_pages)
+
+    tracemalloc.start()
+    try:
+        client.parse_pages(task_pages)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert 0 < len(universities) <= num_universities
+    assert_within_threshold(benchmark, "parse_pages", num_universities)
+    assert_peak_memory_within_threshold(peak_bytes, "parse_pages", num_universities)
+
+
+def test_update_current_state(
+    benchmark: BenchmarkFixture,
+    db: Session,
+    universities: list[UniversityRecord],
+    num_universities: int
+) -> None:
+    service = SyncService(db)
+
+    benchmark.pedantic(
+        service._update_current_state,
+        args=(universities,),
+        rounds=_rounds(num_universities),
+        warmup_rounds=1
+    )
+
+    assert db.query(UniversityCurrent).count() == len(universities)
+    assert_within_threshold(benchmark, "update_current_state", num_universities)
+
+
+def test_create_snapshot(
+    benchmark: BenchmarkFixture,
+    db: Session,
+    universities: list[UniversityRecord],
+    num_universities: int
+) -> None:
+    service = SyncService(db)
+
+    benchmark.pedantic(
+        service._create_snapshot,
+        args=(universities,),
+        rounds=_rounds(num_universities),
+        warmup_rounds=1
+    )
+
+    assert_within_threshold(benchmark, "create_snapshot", num_universities)
@@ -0,0 +1,64 @@
+"""Regression ceilings for the benchmark suite.
+
+Each THRESHOLDS entry is the maximum acceptable mean wall time, in seconds,
+for one benchmarked operation at a given number of universities, and each
+MEMORY_THRESHOLDS entry the maximum tracemalloc peak in bytes. The values carry
+generous headroom over measured baselines so that only real regressions
+trip them. Set BENCHMARK_THRESHOLD_SCALE to loosen or tighten all of them
+at once on slower or faster hardware.
+"""
+import os
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+THRESHOLD_SCALE = float(os.environ.get("BENCHMARK_THRESHOLD_SCALE", "1.0"))
+
+THRESHOLDS: dict[str, dict[int, float]] = {
+    # Sync pipeline
+    "execute_sync": {100: 0.2, 10_000: 8.0, 100_000: 100.0},
+    "update_current_state": {100: 0.05, 10_000: 2.5, 100_000: 25.0},
+    "create_snapshot": {100: 0.05, 10_000: 3.0, 100_000: 35.0},
+    "backfill": {100: 1.0, 10_000: 60.0, 100_000: 600.0},
+    "parse_pages": {100: 0.005, 10_000: 0.4, 100_000: 4.0},
+    # Metrics endpoints
+    "metrics_current": {100: 0.03, 10_000: 1.0, 100_000: 8.0},
+    "metrics_current_as_of": {100: 0.03, 10_000: 0.06, 100_000: 0.3},
+    "metrics_timeline": {100: 0.02, 10_000: 0.03, 100_000: 0.03},
+    "metrics_growth": {100: 0.03, 10_000: 1.0, 100_000: 8.0},
+    "metrics_hardware_distribution": {100: 0.03, 10_000: 1.0, 100_000: 8.0},
+    "metrics_current_burst": {100: 0.05, 10_000: 2.0, 100_000: 16.0},
+    "metrics_hardware_distribution_burst": {100: 0.05, 10_000: 2.0, 100_000: 16.0},
+    # Universities endpoints
+    "universities_list": {100: 0.02, 10_000: 0.5, 100_000: 5.0},
+    "universities_list_search": {100: 0.02, 10_000: 0.05, 100_000: 0.15},
+    "universities_list_tenstorrent": {100: 0.02, 10_000: 0.4, 100_000: 4.0},
+    "universities_list_as_of": {100: 0.03, 10_000: 0.5, 100_000: 5.0},
+    "university_detail": {100: 0.015, 10_000: 0.015, 100_000: 0.015},
+    "university_history": {100: 0.02, 10_000: 0.04, 100_000: 0.15},
+    "university_history_batch": {100: 0.03, 10_000: 0.1, 100_000: 0.3},
+    # Static dashboard bundle
+    "publish_bundle": {100: 0.1, 10_000: 3.0, 100_000: 35.0},
+}
+
+MEMORY_THRESHOLDS: dict[str, dict[int, int]] = {
+    "parse_pages": {100: 1_000_000, 10_000: 15_000_000, 100_000: 150_000_000},
+}
+
+
+def assert_within_threshold(benchmark: BenchmarkFixture, name: str, num_universities: int) -> None:
+    """Fail the benchmark if its mean exceeds the recorded ceiling."""
+    limit = THRESHOLDS[name][num_universities] * THRESHOLD_SCALE
+    mean = benchmark.stats.stats.mean
+    assert mean <= limit, (
+        f"{name} at {num_universities} universities took {mean:.4f}s on average, "
+        f"over the {limit:.4f}s regression threshold"
+    )
+
+
+def assert_peak_memory_within_threshold(peak_bytes: int, name: str, num_universities: int) -> None:
+    """Fail if a traced allocation peak exceeds the recorded ceiling."""
+    limit = MEMORY_THRESHOLDS[name][num_universities] * THRESHOLD_SCALE
+    assert peak_bytes <= limit, (
+        f"{name} at {num_universities} universities peaked at {peak_bytes / 1e6:.1f}MB, "
+        f"over the {limit / 1e6:.1f}MB regression threshold"
+    )
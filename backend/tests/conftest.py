@@ -0,0 +1,90 @@
+import os
+import tempfile
+
+# Settings are read once at import time, so point the app at throwaway
+# storage and the fake Asana field GIDs before anything imports it.
+_TMP_DIR = tempfile.mkdtemp(prefix="academic-program-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/app.db"
+os.environ["ENABLE_SCHEDULED_SYNC"] = "false"
+os.environ["ASANA_ACCESS_TOKEN"] = "test-token"
+
+from tests.fake_asana import (  # noqa: E402
+    FIELD_HARDWARE_TYPES,
+    FIELD_POINT_OF_CONTACT,
+    FIELD_RESEARCHERS_COUNT,
+    FIELD_STUDENTS_COUNT,
+    FakeAsanaConfig,
+    FakeAsanaServer,
+)
+
+os.environ["ASANA_PROJECT_GID"] = FakeAsanaConfig().project_gid
+os.environ["ASANA_FIELD_RESEARCHERS_COUNT"] = FIELD_RESEARCHERS_COUNT
+os.environ["ASANA_FIELD_STUDENTS_COUNT"] = FIELD_STUDENTS_COUNT
+os.environ["ASANA_FIELD_HARDWARE_TYPES"] = FIELD_HARDWARE_TYPES
+os.environ["ASANA_FIELD_POINT_OF_CONTACT"] = FIELD_POINT_OF_CONTACT
+
+from collections.abc import Iterator  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.database import Base, get_db  # noqa: E402
+from app.instrumentation import instrument_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.asana_client import close_asana_client  # noqa: E402
+
+FAKE_ASANA_TASKS = 20
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="run large-scale (100k university) cases",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[Session]:
+    """Session on an empty database of its own, configured like SessionLocal."""
+    engine = create_engine(f"sqlite:///{tmp_path}/test.db", connect_args={"check_same_thread": False})
+    instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db: Session) -> Iterator[TestClient]:
+    """API client whose requests all use the test's session."""
+    app.dependency_overrides[get_db] = lambda: db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def fake_asana(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeAsanaServer]:
+    """A small fake Asana project that the shared AsanaClient talks to for the test."""
+    with FakeAsanaServer(FakeAsanaConfig(num_tasks=FAKE_ASANA_TASKS)) as server:
+        monkeypatch.setattr(get_settings(), "asana_api_url", server.url)
+        close_asana_client()
+        yield server
+        close_asana_client()
@@ -0,0 +1,25 @@
+import json
+from datetime import datetime
+
+from app.services.asana_client import UniversityRecord
+
+
+def university_record(
+    gid: str,
+    researchers: int = 1,
+    students: int = 10,
+    hardware: list[str] | None = None,
+    name: str | None = None,
+    point_of_contact: str | None = None,
+    created_at: datetime | None = None
+) -> UniversityRecord:
+    """A parsed sync record with just the values a test cares about."""
+    return UniversityRecord(
+        asana_task_gid=gid,
+        university_name=name or f"University {gid}",
+        researchers_count=researchers,
+        students_count=students,
+        hardware_json=json.dumps(hardware or []),
+        point_of_contact=point_of_contact,
+        created_at=created_at,
+    )
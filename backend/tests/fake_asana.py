@@ -0,0 +1,308 @@
+"""Local stand-in for the subset of the Asana REST API used by the backend.
+
+The fake serves a synthetic project whose size, section layout and custom
+fields are configurable, along with a history of custom-field change stories
+per task, and can inject latency and 429 rate-limit responses so sync and
+backfill behaviour can be exercised without talking to app.asana.com.
+"""
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+FIELD_RESEARCHERS_COUNT = "9000000000000001"
+FIELD_STUDENTS_COUNT = "9000000000000002"
+FIELD_HARDWARE_TYPES = "9000000000000003"
+FIELD_POINT_OF_CONTACT = "9000000000000004"
+
+HARDWARE_TYPES = ["Grayskull", "Wormhole n150", "Wormhole n300", "Blackhole p100", "Blackhole p150", "Galaxy"]
+SECTIONS = ["Active", "Onboarding", "Prospective", "De-scoped"]
+
+
+@dataclass
+class FakeAsanaConfig:
+    """Shape of the synthetic project served by the fake."""
+
+    project_gid: str = "1200000000000000"
+    num_tasks: int = 100
+    descoped_ratio: float = 0.05
+    completed_ratio: float = 0.02
+    hardware_ratio: float = 0.6
+    latency_ms: float = 0.0
+    rate_limit_every: int = 0  # Respond 429 to every Nth request (0 disables)
+    retry_after_seconds: int = 1
+    changes_per_task: int = 8  # Custom-field and name change stories per task
+    comments_per_task: int = 2  # Stories the backfill has to skip over
+    history_end: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    seed: int = 1234
+    custom_field_gids: dict[str, str] = field(default_factory=lambda: {
+        "researchers_count": FIELD_RESEARCHERS_COUNT,
+        "students_count": FIELD_STUDENTS_COUNT,
+        "hardware_types": FIELD_HARDWARE_TYPES,
+        "point_of_contact": FIELD_POINT_OF_CONTACT,
+    })
+
+
+def generate_tasks(config: FakeAsanaConfig) -> list[dict[str, Any]]:
+    """Build deterministic task payloads shaped like Asana's task resource."""
+    rng = random.Random(config.seed)
+    gids = config.custom_field_gids
+    base_created = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    tasks = []
+
+    for i in range(config.num_tasks):
+        if rng.random() < config.descoped_ratio:
+            section = "De-scoped"
+        else:
+            section = rng.choice(SECTIONS[:-1])
+
+        hardware = []
+        if rng.random() < config.hardware_ratio:
+            hardware = rng.sample(HARDWARE_TYPES, rng.randint(1, 3))
+
+        created_at = base_created + timedelta(hours=i * 3)
+        tasks.append({
+            "gid": str(1300000000000000 + i),
+            "name": f"University {i:06d}",
+            "completed": rng.random() < config.completed_ratio,
+            "created_at": created_at.isoformat().replace("+00:00", "Z"),
+            "memberships": [{
+                "section": {"gid": str(1250000000000000 + SECTIONS.index(section)), "name": section}
+            }],
+            "custom_fields": [
+                {
+                    "gid": gids["researchers_count"],
+                    "name": "Researchers",
+                    "number_value": rng.randint(0, 40),
+                    "display_value": None,
+                },
+                {
+                    "gid": gids["students_count"],
+                    "name": "Students",
+                    "number_value": rng.randint(0, 400),
+                    "display_value": None,
+                },
+                {
+                    "gid": gids["hardware_types"],
+                    "name": "Hardware",
+                    "multi_enum_values": [{"gid": str(1400000000000000 + HARDWARE_TYPES.index(hw)), "name": hw} for hw in hardware],
+                    "display_value": ", ".join(hardware) or None,
+                },
+                {
+                    "gid": gids["point_of_contact"],
+                    "name": "Point of Contact",
+                    "text_value": f"contact{i}@example.edu",
+                    "display_value": f"contact{i}@example.edu",
+                },
+            ],
+        })
+
+    return tasks
+
+
+def generate_stories(config: FakeAsanaConfig, task: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build a deterministic story history for a task, oldest first.
+
+    Changes are generated walking back from the task's current values, so
+    replaying them in order ends exactly at the state the task endpoint serves.
+    """
+    rng = random.Random(f"{config.seed}:{task['gid']}")
+    gids = config.custom_field_gids
+    created_at = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
+    span = max((config.history_end - created_at).total_seconds(), 0)
+    if not span:
+        return []
+
+    def at(seconds: float) -> str:
+        return (created_at + timedelta(seconds=seconds)).isoformat().replace("+00:00", "Z")
+
+    fields = {cf["gid"]: cf for cf in task["custom_fields"]}
+    name = task["name"]
+    stories = []
+
+    for changed_after in sorted((rng.uniform(0, span) for _ in range(config.changes_per_task)), reverse=True):
+        kind = rng.choice(["name", *gids])
+        story: dict[str, Any] = {"resource_type": "story", "created_at": at(changed_after)}
+
+        if kind == "name":
+            old_name = f"{name.split(' (')[0]} ({rng.randint(1, 99)})"
+            story.update(resource_subtype="name_changed", old_name=old_name, new_name=name)
+            name = old_name
+        else:
+            current = fields[gids[kind]]
+            story["custom_field"] = {"gid": current["gid"], "name": current["name"]}
+            if kind == "hardware_types":
+                old = [
+                    {"gid": str(1400000000000000 + HARDWARE_TYPES.index(hw)), "name": hw}
+                    for hw in rng.sample(HARDWARE_TYPES, rng.randint(0, 3))
+                ]
+                story.update(
+                    resource_subtype="multi_enum_custom_field_changed",
+                    old_multi_enum_values=old,
+                    new_multi_enum_values=current["multi_enum_values"]
+                )
+                fields[current["gid"]] = {**current, "multi_enum_values": old}
+            elif kind == "point_of_contact":
+                old = f"contact{rng.randint(0, 999999)}@example.edu"
+                story.update(
+                    resource_subtype="text_custom_field_changed",
+                    old_text_value=old,
+                    new_text_value=current["text_value"]
+                )
+                fields[current["gid"]] = {**current, "text_value": old}
+            else:
+                old = rng.randint(0, 40 if kind == "researchers_count" else 400)
+                story.update(
+                    resource_subtype="number_custom_field_changed",
+                    old_number_value=old,
+                    new_number_value=current["number_value"]
+                )
+                fields[current["gid"]] = {**current, "number_value": old}
+
+        stories.append(story)
+
+    for _ in range(config.comments_per_task):
+        stories.append({
+            "resource_type": "story",
+            "resource_subtype": "comment_added",
+            "created_at": at(rng.uniform(0, span)),
+            "text": "Checked in with the department.",
+        })
+
+    stories.sort(key=lambda story: story["created_at"])
+    for i, story in enumerate(stories):
+        story["gid"] = f"{task['gid']}{i:04d}"
+    return stories
+
+
+def _page(items: list[dict[str, Any]], path: str, limit: int, offset: str | None) -> dict[str, Any]:
+    """Slice a collection the way Asana paginates it with offset tokens."""
+    start = int(offset) if offset else 0
+    end = start + limit
+    next_page = None
+    if end < len(items):
+        next_page = {
+            "offset": str(end),
+            "path": f"{path}?limit={limit}&offset={end}",
+            "uri": f"/api/1.0{path}?limit={limit}&offset={end}",
+        }
+    return {"data": items[start:end], "next_page": next_page}
+
+
+def create_fake_asana_app(config: FakeAsanaConfig) -> FastAPI:
+    """Create an ASGI app that serves the synthetic project."""
+    app = FastAPI()
+    tasks = generate_tasks(config)
+    tasks_by_gid = {task["gid"]: task for task in tasks}
+    state = {"requests": 0, "rate_limited": 0}
+    lock = threading.Lock()
+    app.state.config = config
+    app.state.tasks = tasks
+    app.state.stats = state
+
+    def _throttle() -> JSONResponse | None:
+        with lock:
+            state["requests"] += 1
+            count = state["requests"]
+        if config.latency_ms:
+            time.sleep(config.latency_ms / 1000)
+        if config.rate_limit_every and count % config.rate_limit_every == 0:
+            with lock:
+                state["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"errors": [{"message": "You have made too many requests recently."}]},
+                headers={"Retry-After": str(config.retry_after_seconds)},
+            )
+        return None
+
+    @app.get("/projects/{project_gid}/tasks")
+    def get_tasks_for_project(
+        project_gid: str,
+        limit: int = Query(100, ge=1, le=100),
+        offset: str | None = Query(None),
+    ) -> Any:
+        throttled = _throttle()
+        if throttled:
+            return throttled
+        if project_gid != config.project_gid:
+            return JSONResponse(status_code=404, content={"errors": [{"message": "project: Unknown object"}]})
+
+        return _page(tasks, f"/projects/{project_gid}/tasks", limit, offset)
+
+    @app.get("/tasks/{task_gid}/stories")
+    def get_stories_for_task(
+        task_gid: str,
+        limit: int = Query(100, ge=1, le=100),
+        offset: str | None = Query(None),
+    ) -> Any:
+        throttled = _throttle()
+        if throttled:
+            return throttled
+        task = tasks_by_gid.get(task_gid)
+        if task is None:
+            return JSONResponse(status_code=404, content={"errors": [{"message": "task: Unknown object"}]})
+
+        return _page(generate_stories(config, task), f"/tasks/{task_gid}/stories", limit, offset)
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeAsanaServer:
+    """Run the fake Asana app on a local port in a background thread."""
+
+    def __init__(self, config: FakeAsanaConfig | None = None, port: int | None = None) -> None:
+        self.config = config or FakeAsanaConfig()
+        self.port = port or _free_port()
+        self.app = create_fake_asana_app(self.config)
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app,
+            host="127.0.0.1",
+            port=self.port,
+            log_level="warning",
+            access_log=False,
+        ))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return self.app.state.stats
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake Asana server did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def __enter__(self) -> "FakeAsanaServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
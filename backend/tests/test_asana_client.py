@@ -0,0 +1,84 @@
+import logging
+from collections.abc import Iterator
+
+import orjson
+import pytest
+from asana.rest import ApiException
+
+from app.config import get_settings
+from app.services.asana_client import MAX_RATE_LIMIT_RETRIES, AsanaClient, _next_page
+from tests.fake_asana import FakeAsanaConfig, FakeAsanaServer, generate_tasks
+
+CURSOR = {"offset": "abc", "path": "/projects/1/tasks?offset=abc", "uri": "https://app.asana.com/api/1.0/projects/1/tasks?offset=abc"}
+
+
+@pytest.mark.parametrize("page", [
+    {"data": [{"gid": "1", "name": "University"}], "next_page": CURSOR},
+    {"data": [{"gid": "1", "name": "University"}], "next_page": None},
+    {"data": [{"gid": "1", "name": '"next_page": null}'}], "next_page": CURSOR},
+    {"data": [{"gid": "1", "next_page": {"offset": "nested"}}], "next_page": CURSOR},
+    {"next_page": CURSOR, "data": [{"gid": "1", "next_page": None}]},
+    {"data": [{"gid": "1", "next_page": {"offset": "nested"}}]},
+], ids=["cursor", "last-page", "key-in-string", "nested-key", "cursor-first", "no-cursor"])
+def test_next_page_matches_full_decode(page: dict) -> None:
+    body = orjson.dumps(page)
+    assert _next_page(body) == orjson.loads(body).get("next_page")
+
+
+def test_next_page_tolerates_whitespace() -> None:
+    body = b'{\n  "data": [],\n  "next_page": {\n    "offset": "abc"\n  }\n}\n'
+    assert _next_page(body) == {"offset": "abc"}
+
+
+@pytest.fixture
+def rate_limited_asana(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeAsanaServer]:
+    """Fake project of 250 tasks (three pages) answering every Nth request with 429."""
+    config = FakeAsanaConfig(num_tasks=250, rate_limit_every=request.param, retry_after_seconds=0)
+    with FakeAsanaServer(config) as server:
+        monkeypatch.setattr(get_settings(), "asana_api_url", server.url)
+        yield server
+
+
+@pytest.mark.parametrize("rate_limited_asana", [2], indirect=True)
+def test_fetch_retries_rate_limited_pages(rate_limited_asana: FakeAsanaServer, caplog: pytest.LogCaptureFixture) -> None:
+    client = AsanaClient()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.services.asana_client"):
+            pages = client.fetch_task_pages()
+    finally:
+        client.close()
+
+    gids = [task["gid"] for page in pages for task in orjson.loads(page)["data"]]
+    assert gids == [task["gid"] for task in rate_limited_asana.app.state.tasks]
+    # The second and fourth requests were refused; the second and third pages were each retried once
+    assert rate_limited_asana.stats == {"requests": 5, "rate_limited": 2}
+    assert [record.message for record in caplog.records] == ["Rate limited by Asana, retrying in 0s"] * 2
+
+
+@pytest.mark.parametrize("rate_limited_asana", [1], indirect=True)
+def test_fetch_gives_up_after_max_retries(rate_limited_asana: FakeAsanaServer) -> None:
+    client = AsanaClient()
+    try:
+        with pytest.raises(ApiException) as error:
+            client.fetch_task_pages()
+    finally:
+        client.close()
+
+    assert error.value.status == 429
+    assert rate_limited_asana.stats["requests"] == MAX_RATE_LIMIT_RETRIES + 1
+
+
+def test_parse_task_keeps_inactive_tasks_and_flags_them() -> None:
+    tasks = generate_tasks(FakeAsanaConfig(num_tasks=200))
+    client = AsanaClient()
+    parsed = [client.parse_task(task) for task in tasks]
+
+    assert [p.record.asana_task_gid for p in parsed] == [task["gid"] for task in tasks]
+    assert [p.completed for p in parsed] == [task["completed"] for task in tasks]
+    assert [p.descoped for p in parsed] == [
+        task["memberships"][0]["section"]["name"] == "De-scoped" for task in tasks
+    ]
+    assert any(p.descoped for p in parsed) and any(p.completed for p in parsed)
+    active = [p.record.asana_task_gid for p in parsed if not p.completed and not p.descoped]
+    pages = [orjson.dumps({"data": tasks})]
+    assert [record.asana_task_gid for record in client.parse_pages(pages)] == active
@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import orjson
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.snapshot import BackfillTask, Snapshot
+from app.services.asana_client import get_asana_client
+from app.services.backfill_service import BackfillService
+from app.services.bundle_service import MANIFEST_NAME
+from tests.fake_asana import FakeAsanaServer, generate_stories
+
+FIRST_TASK_CREATED = date(2023, 1, 1)  # Where the fake project's task creation dates start
+
+
+def test_backfill_republishes_bundle(
+    db: Session,
+    fake_asana: FakeAsanaServer,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "dashboard_bundle_dir", str(tmp_path))
+    yesterday = date.today() - timedelta(days=1)
+
+    written = BackfillService(db).backfill(yesterday - timedelta(days=9), yesterday, workers=2)
+
+    manifest = orjson.loads((tmp_path / MANIFEST_NAME).read_bytes())
+    timeline = orjson.loads((tmp_path / manifest["files"]["timeline"]).read_bytes())
+    assert written == 10
+    assert [point["date"] for point in timeline["data"]] == [
+        (yesterday - timedelta(days=days_ago)).isoformat() for days_ago in range(9, -1, -1)
+    ]
+
+
+def test_fetch_histories_resumes_from_checkpoint(db: Session, fake_asana: FakeAsanaServer) -> None:
+    service = BackfillService(db)
+    service.fetch_histories(workers=2)
+    gids = db.execute(select(BackfillTask.asana_task_gid).order_by(BackfillTask.asana_task_gid)).scalars().all()
+    db.execute(delete(BackfillTask).where(BackfillTask.asana_task_gid.in_(gids[:10])))
+    db.commit()
+
+    requests_before = fake_asana.stats["requests"]
+    service.fetch_histories(workers=2)
+
+    # One task page plus stories for the ten tasks that lost their checkpoint
+    assert fake_asana.stats["requests"] - requests_before == 11
+    assert db.query(BackfillTask).count() == len(gids)
+
+
+def test_interrupted_backfill_resumes_with_default_range(
+    db: Session,
+    fake_asana: FakeAsanaServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A sync-taken snapshot bounds the default range
+    first_live = FIRST_TASK_CREATED + timedelta(days=60)
+    db.add(Snapshot(snapshot_date=first_live))
+    db.commit()
+
+    service = BackfillService(db)
+    write_snapshot = service._write_snapshot
+    written_days: list[date] = []
+
+    def crash_after_20_days(day: date, states: dict) -> None:
+        if len(written_days) == 20:
+            raise RuntimeError("interrupted")
+        write_snapshot(day, states)
+        written_days.append(day)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(service, "_write_snapshot", crash_after_20_days)
+        with pytest.raises(RuntimeError):
+            service.backfill(workers=2)
+    assert db.query(BackfillTask).count() == len(fake_asana.app.state.tasks)
+
+    requests_before = fake_asana.stats["requests"]
+    written = BackfillService(db).backfill(workers=2)
+
+    # Only the task list is fetched again, and the rest of the same range is written
+    assert fake_asana.stats["requests"] - requests_before == 1
+    assert written == 60 - 20
+    days = db.execute(select(Snapshot.snapshot_date).order_by(Snapshot.snapshot_date)).scalars().all()
+    assert days == [FIRST_TASK_CREATED + timedelta(days=offset) for offset in range(61)]
+    assert db.execute(select(func.count()).where(Snapshot.backfilled.is_(True))).scalar() == 60
+    assert db.query(BackfillTask).count() == 0
+
+
+@pytest.mark.parametrize("days_ahead", [0, 1])
+def test_backfill_rejects_today_and_later(db: Session, days_ahead: int) -> None:
+    with pytest.raises(ValueError):
+        BackfillService(db).backfill(end_date=date.today() + timedelta(days=days_ahead))
+    assert db.query(Snapshot).count() == 0
+
+
+def test_task_without_created_at_starts_at_its_first_story(db: Session, fake_asana: FakeAsanaServer) -> None:
+    task = fake_asana.app.state.tasks[0]
+    first_story = generate_stories(fake_asana.config, task)[0]
+
+    row = BackfillService(db)._task_history({**task, "created_at": None})
+
+    assert orjson.loads(row["versions"])[0][0] == first_story["created_at"][:10]
+
+
+def test_task_without_created_at_or_stories_is_skipped(
+    db: Session,
+    fake_asana: FakeAsanaServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_asana_client(), "fetch_story_pages", lambda gid: [b'{"data": [], "next_page": null}'])
+    task = fake_asana.app.state.tasks[0]
+
+    assert BackfillService(db)._task_history({**task, "created_at": None}) is None
+    assert BackfillService(db)._task_history(task) is not None
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import orjson
+import pytest
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.bundle_service import MANIFEST_NAME, DashboardBundleService, publish_configured_bundle
+
+
+def _versions(bundle_dir: Path) -> list[str]:
+    return sorted(path.name for path in bundle_dir.iterdir() if path.is_dir())
+
+
+@pytest.mark.parametrize("keep_versions", [0, -1])
+def test_keep_versions_must_be_positive(db: Session, tmp_path: Path, keep_versions: int) -> None:
+    with pytest.raises(ValueError):
+        DashboardBundleService(db, tmp_path, keep_versions=keep_versions)
+
+
+def test_publish_prunes_to_keep_versions(db: Session, tmp_path: Path) -> None:
+    service = DashboardBundleService(db, tmp_path, keep_versions=2)
+    published = [service.publish() for _ in range(4)]
+
+    assert _versions(tmp_path) == published[-2:]
+    manifest = orjson.loads((tmp_path / MANIFEST_NAME).read_bytes())
+    assert manifest["version"] == published[-1]
+
+
+def test_single_kept_version_is_the_published_one(db: Session, tmp_path: Path) -> None:
+    service = DashboardBundleService(db, tmp_path, keep_versions=1)
+    service.publish()
+    latest = service.publish()
+
+    assert _versions(tmp_path) == [latest]
+
+
+def test_publish_configured_bundle(db: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "dashboard_bundle_dir", "")
+    assert publish_configured_bundle(db) is None
+
+    monkeypatch.setattr(get_settings(), "dashboard_bundle_dir", str(tmp_path))
+    version = publish_configured_bundle(db)
+    assert _versions(tmp_path) == [version]
+
+
+def test_publish_configured_bundle_logs_failures(
+    db: Session,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    not_a_directory = tmp_path / "bundle"
+    not_a_directory.write_text("")
+    monkeypatch.setattr(get_settings(), "dashboard_bundle_dir", str(not_a_directory))
+
+    assert publish_configured_bundle(db) is None
+    assert "Publishing dashboard bundle failed" in caplog.text
@@ -0,0 +1,114 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.services.asana_client import UniversityRecord
+from app.services.sync_service import SyncService
+from tests.factories import university_record
+
+
+def _sync(db: Session, universities: list[UniversityRecord]) -> int:
+    service = SyncService(db)
+    sync_id = service.start_sync("manual")
+    service._update_current_state(universities, sync_id)
+    return sync_id
+
+
+def _all_changes(client: TestClient, limit: int) -> list[dict[str, Any]]:
+    changes: list[dict[str, Any]] = []
+    cursor = 0
+    while True:
+        page = client.get("/api/v1/changes/", params={"since": cursor, "limit": limit}).json()
+        changes.extend(page["changes"])
+        assert page["next_cursor"] == (page["changes"][-1]["id"] if page["changes"] else cursor)
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return changes
+
+
+@pytest.fixture
+def synced(db: Session) -> tuple[int, int]:
+    first = _sync(db, [
+        university_record("1", 1, 10, point_of_contact="a@example.edu"),
+        university_record("2", 2, 20),
+    ])
+    second = _sync(db, [
+        university_record("1", 5, 10, hardware=["Galaxy"], point_of_contact="a@example.edu"),
+        university_record("3", 3, 30, name="New University"),
+    ])
+    return first, second
+
+
+def test_sync_logs_added_removed_and_updated_fields(client: TestClient, synced: tuple[int, int]) -> None:
+    first, second = synced
+    changes = [
+        (c["sync_id"], c["asana_task_gid"], c["change_type"], c["field"], c["old_value"], c["new_value"])
+        for c in _all_changes(client, 500)
+    ]
+
+    assert changes == [
+        (first, "1", "added", None, None, {
+            "university_name": "University 1",
+            "researchers_count": 1,
+            "students_count": 10,
+            "hardware_types": [],
+            "point_of_contact": "a@example.edu",
+        }),
+        (first, "2", "added", None, None, {
+            "university_name": "University 2",
+            "researchers_count": 2,
+            "students_count": 20,
+            "hardware_types": [],
+            "point_of_contact": None,
+        }),
+        (second, "1", "updated", "researchers_count", 1, 5),
+        (second, "1", "updated", "hardware_types", [], ["Galaxy"]),
+        (second, "3", "added", None, None, {
+            "university_name": "New University",
+            "researchers_count": 3,
+            "students_count": 30,
+            "hardware_types": [],
+            "point_of_contact": None,
+        }),
+        (second, "2", "removed", None, {
+            "university_name": "University 2",
+            "researchers_count": 2,
+            "students_count": 20,
+            "hardware_types": [],
+            "point_of_contact": None,
+        }, None),
+    ]
+
+
+def test_unchanged_sync_logs_nothing(client: TestClient, db: Session, synced: tuple[int, int]) -> None:
+    before = _all_changes(client, 500)
+    _sync(db, [
+        university_record("1", 5, 10, hardware=["Galaxy"], point_of_contact="a@example.edu"),
+        university_record("3", 3, 30, name="New University"),
+    ])
+    assert _all_changes(client, 500) == before
+
+
+def test_cursor_pages_through_the_feed(client: TestClient, synced: tuple[int, int]) -> None:
+    everything = _all_changes(client, 500)
+    assert len(everything) == 6
+
+    first_page = client.get("/api/v1/changes/", params={"since": 0, "limit": 4}).json()
+    assert [c["id"] for c in first_page["changes"]] == [c["id"] for c in everything[:4]]
+    assert first_page["next_cursor"] == everything[3]["id"]
+    assert first_page["has_more"] is True
+
+    last_page = client.get("/api/v1/changes/", params={"since": first_page["next_cursor"], "limit": 4}).json()
+    assert [c["id"] for c in last_page["changes"]] == [c["id"] for c in everything[4:]]
+    assert last_page["next_cursor"] == everything[-1]["id"]
+    assert last_page["has_more"] is False
+
+    # An exact fit does not report more, and a caught-up cursor stays put
+    exact = client.get("/api/v1/changes/", params={"since": 0, "limit": 6}).json()
+    assert exact["has_more"] is False
+    caught_up = client.get("/api/v1/changes/", params={"since": everything[-1]["id"]}).json()
+    assert caught_up == {"changes": [], "next_cursor": everything[-1]["id"], "has_more": False}
+
+    assert _all_changes(client, 1) == everything
@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import Snapshot, UniversitySnapshot
+
+BATCH_URL = "/api/v1/universities/history:batch"
+
+# Mondays fall on Jan 1, Jan 8, Feb 5 and Feb 19
+SNAPSHOT_DATES = [
+    date(2024, 1, 1),
+    date(2024, 1, 3),
+    date(2024, 1, 8),
+    date(2024, 1, 10),
+    date(2024, 2, 5),
+    date(2024, 2, 20),
+]
+
+
+def _add_snapshots(db: Session, days: list[date], gids: tuple[str, ...] = ("1", "2")) -> None:
+    """One snapshot per day; each university's counts identify the day they came from."""
+    for day in days:
+        snapshot = Snapshot(snapshot_date=day)
+        db.add(snapshot)
+        db.flush()
+        for i, gid in enumerate(gids):
+            db.add(UniversitySnapshot(
+                snapshot_id=snapshot.id,
+                asana_task_gid=gid,
+                university_name=f"University {gid}",
+                researchers_count=day.toordinal() + i,
+                students_count=10 * day.toordinal(),
+            ))
+    db.commit()
+
+
+def _series(days: list[date], offset: int = 0) -> dict[str, list[Any]]:
+    return {
+        "dates": [day.isoformat() for day in days],
+        "researchers": [day.toordinal() + offset for day in days],
+        "students": [10 * day.toordinal() for day in days],
+    }
+
+
+def _batch(client: TestClient, **body: Any) -> dict[str, Any]:
+    response = client.post(BATCH_URL, json={"task_gids": ["1", "2"], **body})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def snapshots(db: Session) -> Session:
+    _add_snapshots(db, SNAPSHOT_DATES)
+    return db
+
+
+@pytest.mark.parametrize(("resolution", "kept"), [
+    ("day", SNAPSHOT_DATES),
+    ("week", [date(2024, 1, 3), date(2024, 1, 10), date(2024, 2, 5), date(2024, 2, 20)]),
+    ("month", [date(2024, 1, 10), date(2024, 2, 20)]),
+])
+def test_resolution_keeps_last_snapshot_per_period(
+    client: TestClient,
+    snapshots: Session,
+    resolution: str,
+    kept: list[date]
+) -> None:
+    body = _batch(client, start_date="2024-01-01", end_date="2024-02-29", resolution=resolution)
+
+    assert body["resolution"] == resolution
+    assert body["histories"] == {"1": _series(kept), "2": _series(kept, offset=1)}
+
+
+def test_rows_are_limited_to_the_date_range(client: TestClient, snapshots: Session) -> None:
+    body = _batch(client, start_date="2024-01-03", end_date="2024-02-05")
+
+    assert (body["start_date"], body["end_date"]) == ("2024-01-03", "2024-02-05")
+    assert body["histories"]["1"] == _series(SNAPSHOT_DATES[1:5])
+
+
+def test_default_window_is_the_last_90_days(client: TestClient, db: Session) -> None:
+    today = date.today()
+    _add_snapshots(db, [today - timedelta(days=days_ago) for days_ago in (100, 91, 90, 10, 0)])
+
+    body = _batch(client)
+
+    assert (body["start_date"], body["end_date"]) == ((today - timedelta(days=90)).isoformat(), today.isoformat())
+    assert body["histories"]["1"] == _series([today - timedelta(days=90), today - timedelta(days=10), today])
+
+
+def test_start_after_end_is_rejected(client: TestClient, snapshots: Session) -> None:
+    response = client.post(BATCH_URL, json={"task_gids": ["1"], "start_date": "2024-02-01", "end_date": "2024-01-01"})
+    assert response.status_code == 400
+
+
+def test_unknown_and_duplicate_gids(client: TestClient, snapshots: Session) -> None:
+    response = client.post(BATCH_URL, json={
+        "task_gids": ["1", "unknown", "1"],
+        "start_date": "2024-01-01",
+        "end_date": "2024-02-29",
+    })
+
+    assert response.status_code == 200
+    assert response.json()["histories"] == {
+        "1": _series(SNAPSHOT_DATES),
+        "unknown": {"dates": [], "researchers": [], "students": []},
+    }
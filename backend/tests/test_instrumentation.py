@@ -0,0 +1,53 @@
+import re
+
+from fastapi.testclient import TestClient
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy.orm import Session
+
+from app.instrumentation import SYNC_STAGES
+from app.models.snapshot import SyncLog
+from app.services.sync_service import SyncService
+from tests.fake_asana import FakeAsanaServer
+
+
+def test_server_timing_reports_request_queries(client: TestClient) -> None:
+    response = client.get("/api/v1/metrics/current")
+
+    assert response.status_code == 200
+    db_timing, total_timing = response.headers["Server-Timing"].split(", ")
+    # One aggregate query and one scan for the hardware counts
+    assert re.fullmatch(r'db;dur=\d+\.\d{2};desc="2 queries"', db_timing)
+    assert re.fullmatch(r"total;dur=\d+\.\d{2}", total_timing)
+
+
+def test_prometheus_exposes_request_latency_by_route_template(client: TestClient) -> None:
+    assert client.get("/api/v1/universities/404404").status_code == 404
+
+    response = client.get("/api/v1/metrics/prometheus")
+
+    assert response.status_code == 200
+    assert response.headers.get_list("content-type") == [CONTENT_TYPE_LATEST]
+    samples = {
+        (sample.name, tuple(sorted(sample.labels.items())))
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+    labels = (("method", "GET"), ("route", "/api/v1/universities/{task_gid}"), ("status", "404"))
+    assert ("http_request_duration_seconds_count", labels) in samples
+
+
+def test_execute_sync_stores_stage_timings(db: Session, fake_asana: FakeAsanaServer) -> None:
+    service = SyncService(db)
+    sync_id = service.start_sync("manual")
+    service.execute_sync(sync_id)
+
+    log = db.get(SyncLog, sync_id)
+    assert log.status == "success"
+    for stage in SYNC_STAGES:
+        seconds = getattr(log, f"{stage}_seconds")
+        if stage == "publish":
+            # No bundle directory is configured, so nothing is published
+            assert seconds is None
+        else:
+            assert seconds is not None and seconds >= 0
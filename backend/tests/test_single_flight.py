@@ -0,0 +1,148 @@
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from prometheus_client import REGISTRY
+
+from app.services.single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def _outcomes(name: str) -> dict[str, float]:
+    return {
+        outcome: REGISTRY.get_sample_value(
+            "coalesced_calls_total", {"operation": name, "outcome": outcome}
+        ) or 0.0
+        for outcome in ("executed", "coalesced", "timeout")
+    }
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for callers"
+        time.sleep(0.001)
+
+
+class _Computation:
+    """Counts its runs; the first run blocks until released and later ones take `duration`."""
+
+    def __init__(self, error: Exception | None = None, duration: float = 0.0) -> None:
+        self.runs = itertools.count(1)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+        self.duration = duration
+
+    def __call__(self) -> dict[str, int]:
+        run = next(self.runs)
+        if run == 1:
+            self.started.set()
+            self.release.wait(5)
+        else:
+            time.sleep(self.duration)
+        if self.error is not None:
+            raise self.error
+        return {"run": run}
+
+
+def _start_leader(executor: ThreadPoolExecutor, flight: SingleFlight, computation: _Computation) -> Future:
+    leader = executor.submit(flight.do, "key", computation)
+    assert computation.started.wait(5)
+    return leader
+
+
+def _join(executor: ThreadPoolExecutor, flight: SingleFlight, computation: _Computation, count: int) -> list[Future]:
+    waiters = [executor.submit(flight.do, "key", computation) for _ in range(count)]
+    _wait_for(lambda: flight._calls["key"].waiters == count)
+    return waiters
+
+
+def test_concurrent_callers_share_one_result() -> None:
+    flight = SingleFlight[dict[str, int]]("test_shared_result", timeout=5)
+    computation = _Computation()
+
+    with ThreadPoolExecutor(CALLERS) as executor:
+        leader = _start_leader(executor, flight, computation)
+        waiters = _join(executor, flight, computation, CALLERS - 1)
+        computation.release.set()
+        results = [future.result() for future in [leader, *waiters]]
+
+    assert all(result is results[0] for result in results)
+    assert results[0] == {"run": 1}
+    assert _outcomes("test_shared_result") == {"executed": 1, "coalesced": CALLERS - 1, "timeout": 0}
+    # Nothing outlives the call: the next caller runs again
+    assert flight.do("key", computation) == {"run": 2}
+
+
+def test_concurrent_callers_share_one_exception() -> None:
+    flight = SingleFlight[dict[str, int]]("test_shared_exception", timeout=5)
+    computation = _Computation(error=ValueError("scan failed"))
+
+    with ThreadPoolExecutor(CALLERS) as executor:
+        leader = _start_leader(executor, flight, computation)
+        waiters = _join(executor, flight, computation, CALLERS - 1)
+        computation.release.set()
+        errors = [future.exception() for future in [leader, *waiters]]
+
+    assert all(error is computation.error for error in errors)
+    assert next(computation.runs) == 2
+
+
+def test_different_keys_run_separately() -> None:
+    flight = SingleFlight[str]("test_keys", timeout=5)
+    assert [flight.do(key, lambda key=key: key) for key in ("a", "b", None)] == ["a", "b", None]
+    assert _outcomes("test_keys")["executed"] == 3
+
+
+def test_overdue_run_is_replaced_by_one_waiter() -> None:
+    flight = SingleFlight[dict[str, int]]("test_timeout", timeout=0.5)
+    # Long enough for every timed-out waiter to find the replacement still running
+    computation = _Computation(duration=0.2)
+
+    with ThreadPoolExecutor(CALLERS) as executor:
+        leader = _start_leader(executor, flight, computation)
+        waiters = _join(executor, flight, computation, CALLERS - 1)
+        waiter_results = [future.result() for future in waiters]
+        computation.release.set()
+        leader_result = leader.result()
+
+    # One waiter ran the replacement and the others shared it, rather than each running their own
+    assert leader_result == {"run": 1}
+    assert all(result is waiter_results[0] for result in waiter_results)
+    assert waiter_results[0] == {"run": 2}
+    assert next(computation.runs) == 3
+    assert _outcomes("test_timeout") == {"executed": 2, "coalesced": CALLERS - 2, "timeout": CALLERS - 1}
+
+
+def test_per_call_timeout_overrides_default() -> None:
+    flight = SingleFlight[dict[str, int]]("test_call_timeout", timeout=60)
+    computation = _Computation()
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", computation, 0.1)
+        assert computation.started.wait(5)
+        waiter = executor.submit(flight.do, "key", computation)
+        assert waiter.result(timeout=5) == {"run": 2}
+        computation.release.set()
+        assert leader.result() == {"run": 1}
+
+
+def test_forget_starts_new_callers_afresh() -> None:
+    flight = SingleFlight[dict[str, int]]("test_forget", timeout=5)
+    computation = _Computation()
+
+    with ThreadPoolExecutor(CALLERS) as executor:
+        leader = _start_leader(executor, flight, computation)
+        early = _join(executor, flight, computation, 2)
+        flight.forget()
+        assert flight.do("key", computation) == {"run": 2}
+        computation.release.set()
+
+        # Callers that joined before forget() still share the original run
+        assert [future.result() for future in early] == [{"run": 1}] * 2
+        assert leader.result() == {"run": 1}
+    assert flight._calls == {}
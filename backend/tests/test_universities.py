@@ -0,0 +1,51 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.schemas.university import UniversityListResponse, UniversityResponse
+from app.services.sync_service import SyncService
+from tests.factories import university_record
+
+
+@pytest.fixture
+def synced(db: Session) -> Session:
+    universities = [
+        university_record(
+            "1", 4, 40,
+            hardware=["Wormhole n150", "Galaxy"],
+            point_of_contact="a@example.edu",
+            created_at=datetime(2024, 5, 1, 12, 30)
+        ),
+        university_record("2", 2, 20),  # Asana gave no creation date
+    ]
+    service = SyncService(db)
+    service._update_current_state(universities)
+    service._create_snapshot(universities)
+    return db
+
+
+@pytest.mark.parametrize("params", [{}, {"as_of": date.today().isoformat()}], ids=["current", "as_of"])
+def test_list_matches_response_schema(client: TestClient, synced: Session, params: dict[str, str]) -> None:
+    response = client.get("/api/v1/universities/", params=params)
+
+    assert response.status_code == 200
+    listing = UniversityListResponse.model_validate(response.json())
+    assert listing.total == 2
+    by_gid = {uni.asana_task_gid: uni for uni in listing.universities}
+    assert by_gid["1"].hardware_types == ["Wormhole n150", "Galaxy"]
+    assert by_gid["2"].hardware_types == []
+    assert isinstance(response.json()["universities"][0]["hardware_types"], list)
+
+
+def test_detail_matches_response_schema(client: TestClient, synced: Session) -> None:
+    response = client.get("/api/v1/universities/1")
+
+    assert response.status_code == 200
+    university = UniversityResponse.model_validate(response.json())
+    assert university.hardware_types == ["Wormhole n150", "Galaxy"]
+    assert university.created_at == datetime(2024, 5, 1, 12, 30)
+    assert (university.researchers_count, university.students_count, university.point_of_contact) == (
+        4, 40, "a@example.edu"
+    )
@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.snapshot import Snapshot, UniversityCurrent, UniversityVersion
+from app.services import sync_service
+from app.services.asana_client import UniversityRecord
+from app.services.metrics_service import MetricsService
+from app.services.sync_service import SyncService
+from app.services.university_service import UniversityService
+from app.services.version_service import UniversityVersionService
+from tests.factories import university_record
+
+FIRST = date(2024, 1, 10)
+SECOND = date(2024, 1, 20)
+THIRD = date(2024, 1, 30)
+
+
+def test_snapshot_older_than_latest_keeps_its_rows(db: Session) -> None:
+    tomorrow = date.today() + timedelta(days=1)
+    db.add(Snapshot(snapshot_date=tomorrow))
+    db.commit()
+
+    SyncService(db)._create_snapshot([university_record("1"), university_record("2")])
+
+    valid_today = db.query(UniversityVersion).filter(*UniversityVersionService.valid_at(date.today())).all()
+    assert sorted(version.asana_task_gid for version in valid_today) == ["1", "2"]
+
+
+def _snapshot_on(
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    day: date,
+    universities: list[UniversityRecord]
+) -> None:
+    """Take a sync snapshot as if it ran on `day`."""
+    class _Date(date):
+        @classmethod
+        def today(cls) -> date:
+            return day
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sync_service, "date", _Date)
+        SyncService(db)._create_snapshot(universities)
+
+
+def _as_of(db: Session, as_of: date) -> dict[str, tuple[int, int]]:
+    listing = UniversityService(db).list_universities(as_of=as_of)
+    assert listing["total"] == len(listing["universities"])
+    return {
+        row["asana_task_gid"]: (row["researchers_count"], row["students_count"])
+        for row in listing["universities"]
+    }
+
+
+@pytest.fixture
+def history(db: Session, monkeypatch: pytest.MonkeyPatch) -> Session:
+    """University 2 is dropped from the second snapshot and back with new counts in the third."""
+    _snapshot_on(db, monkeypatch, FIRST, [university_record("1", 1, 10), university_record("2", 2, 20)])
+    _snapshot_on(db, monkeypatch, SECOND, [university_record("1", 5, 50)])
+    _snapshot_on(db, monkeypatch, THIRD, [university_record("1", 5, 50), university_record("2", 3, 30)])
+    return db
+
+
+def test_as_of_between_snapshots(history: Session) -> None:
+    as_of = FIRST + timedelta(days=5)
+    assert _as_of(history, as_of) == {"1": (1, 10), "2": (2, 20)}
+
+    metrics = MetricsService(history).get_current_metrics(as_of)
+    first = history.query(Snapshot).filter(Snapshot.snapshot_date == FIRST).one()
+    assert (metrics.total_universities, metrics.total_researchers, metrics.total_students) == (2, 3, 30)
+    assert metrics.last_updated == first.created_at
+
+
+def test_as_of_removed_and_readded(history: Session) -> None:
+    assert _as_of(history, SECOND) == {"1": (5, 50)}
+    assert _as_of(history, THIRD - timedelta(days=1)) == {"1": (5, 50)}
+    assert _as_of(history, THIRD) == {"1": (5, 50), "2": (3, 30)}
+    assert _as_of(history, THIRD + timedelta(days=30)) == {"1": (5, 50), "2": (3, 30)}
+
+    metrics = MetricsService(history).get_current_metrics(SECOND)
+    assert (metrics.total_universities, metrics.total_researchers, metrics.total_students) == (1, 5, 50)
+
+
+def test_as_of_before_first_snapshot(history: Session) -> None:
+    as_of = FIRST - timedelta(days=1)
+    assert _as_of(history, as_of) == {}
+
+    metrics = MetricsService(history).get_current_metrics(as_of)
+    assert (metrics.total_universities, metrics.total_researchers, metrics.total_students) == (0, 0, 0)
+    assert metrics.last_updated is None
+
+
+def test_rerecording_a_day_replaces_it(history: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    _snapshot_on(history, monkeypatch, THIRD, [university_record("1", 5, 50), university_record("2", 4, 40)])
+    assert _as_of(history, THIRD) == {"1": (5, 50), "2": (4, 40)}
+
+    _snapshot_on(history, monkeypatch, THIRD, [university_record("1", 6, 60)])
+    assert _as_of(history, THIRD) == {"1": (6, 60)}
+    # Earlier dates are untouched and the replaced recordings left no versions behind
+    assert _as_of(history, SECOND) == {"1": (5, 50)}
+    assert _as_of(history, FIRST) == {"1": (1, 10), "2": (2, 20)}
+    assert history.query(UniversityVersion).count() == 4
+
+    metrics = MetricsService(history).get_current_metrics(THIRD)
+    assert (metrics.total_universities, metrics.total_researchers, metrics.total_students) == (1, 6, 60)
+
+
+def test_versions_without_asana_created_at_use_first_seen_time(db: Session) -> None:
+    universities = [university_record("1")]
+    service = SyncService(db)
+    service._update_current_state(universities)
+    service._create_snapshot(universities)
+
+    current = db.query(UniversityCurrent).one()
+    version = db.query(UniversityVersion).one()
+    assert version.created_at is not None
+    assert version.created_at == current.created_at
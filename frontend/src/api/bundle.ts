@@ -0,0 +1,50 @@
+import axios, { type AxiosResponse } from 'axios';
+
+import type { BundleManifest, BundleView } from '../types/bundle.ts';
+
+const BUNDLE_BASE_URL = import.meta.env.VITE_DASHBOARD_BUNDLE_URL || '/dashboard-bundle';
+
+const bundleClient = axios.create({
+  baseURL: BUNDLE_BASE_URL,
+});
+
+let pendingManifest: Promise<BundleManifest | null> | null = null;
+
+function isManifest(data: unknown): data is BundleManifest {
+  // Without a bundle, SPA fallbacks may answer the manifest URL with index.html
+  return typeof data === 'object' && data !== null && 'version' in data && 'files' in data;
+}
+
+function getManifest(): Promise<BundleManifest | null> {
+  // Share one manifest request between the queries a dashboard load fires together
+  if (!pendingManifest) {
+    pendingManifest = bundleClient.get<unknown>('/manifest.json')
+      .then(res => (isManifest(res.data) ? res.data : null))
+      .catch(() => null)
+      .finally(() => {
+        pendingManifest = null;
+      });
+  }
+  return pendingManifest;
+}
+
+/**
+ * Read a view from the static dashboard bundle published after each sync,
+ * falling back to the API when there is no bundle, it was rendered for
+ * different parameters, or the file cannot be loaded.
+ */
+export async function fromBundle<T>(
+  view: BundleView,
+  fetchFromApi: () => Promise<AxiosResponse<T>>,
+  matches: (manifest: BundleManifest) => boolean = () => true
+): Promise<AxiosResponse<T>> {
+  const manifest = await getManifest();
+  if (manifest && matches(manifest)) {
+    try {
+      return await bundleClient.get<T>(`/${manifest.files[view]}`);
+    } catch {
+      // Fall through to the API, e.g. if the version was pruned meanwhile
+    }
+  }
+  return fetchFromApi();
+}
@@ -1,5 +1,6 @@
 import type { AxiosResponse } from 'axios';
 
+import { fromBundle } from './bundle.ts';
 import { apiClient } from './index.ts';
 import type { University, UniversityListResponse } from '../types/university.ts';
 
@@ -10,11 +11,31 @@ export interface UniversityHistoryEntry {
   hardware_types: string[];
 }
 
+export type HistoryResolution = 'day' | 'week' | 'month';
+
+export interface UniversityHistorySeries {
+  dates: string[];
+  researchers: number[];
+  students: number[];
+}
+
+export interface UniversityHistoryBatchResponse {
+  start_date: string;
+  end_date: string;
+  resolution: HistoryResolution;
+  histories: Record<string, UniversityHistorySeries>;
+}
+
 export const universitiesApi = {
   getAll(search?: string, sortBy: string = 'university_name', hasTenstorrent?: boolean): Promise<AxiosResponse<UniversityListResponse>> {
-    return apiClient.get<UniversityListResponse>('/universities/', {
+    const fetchFromApi = () => apiClient.get<UniversityListResponse>('/universities/', {
       params: { search, sort_by: sortBy, has_tenstorrent: hasTenstorrent }
     });
+    // The bundle only holds the unfiltered list in default order
+    if (search || sortBy !== 'university_name' || hasTenstorrent) {
+      return fetchFromApi();
+    }
+    return fromBundle('universities', fetchFromApi);
   },
 
   getById(taskGid: string): Promise<AxiosResponse<University>> {
@@ -26,4 +47,18 @@ export const universitiesApi = {
       params: { limit }
     });
   },
+
+  getHistoryBatch(
+    taskGids: string[],
+    startDate?: string,
+    endDate?: string,
+    resolution: HistoryResolution = 'day'
+  ): Promise<AxiosResponse<UniversityHistoryBatchResponse>> {
+    return apiClient.post<UniversityHistoryBatchResponse>('/universities/history:batch', {
+      task_gids: taskGids,
+      start_date: startDate,
+      end_date: endDate,
+      resolution
+    });
+  },
 };
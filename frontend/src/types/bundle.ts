@@ -0,0 +1,16 @@
+export type BundleView = 'current' | 'growth' | 'hardware_distribution' | 'timeline' | 'universities';
+
+export interface BundleManifest {
+  version: string;
+  generated_at: string;
+  files: Record<BundleView, string>;
+  params: {
+    timeline: {
+      start_date: string;
+      end_date: string;
+    };
+    growth: {
+      period_days: number;
+    };
+  };
+}